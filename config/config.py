@@ -50,6 +50,10 @@ class Config:
     BROWSER_TYPE: str = os.getenv('BROWSER_TYPE', 'chromium')
     TIMEOUT: int = int(os.getenv('TIMEOUT', '30000'))
     SLOW_MO: int = int(os.getenv('SLOW_MO', '500'))
+    # Persistent Chrome profile (cookies, HTTP cache) reused across runs
+    CHROME_PROFILE_DIR: Path = Path(os.getenv(
+        'CHROME_PROFILE_DIR', str(Path.home() / '.cache' / 'tj_tool' / 'chrome-profile')
+    ))
     
     # ====================================
     # Automation Behavior
@@ -269,8 +269,12 @@ def _launch_browser_and_auth(p, authenticator, headless, slow_mo):
     return browser, page
 
 
-def run_v4(csv_path: Path, dry_run: bool = False, headless: bool = False, slow_mo: int = 500, name_prefix: str = "", live: bool = False):
-    """Main runner for V4 campaign creation."""
+def run_v4(csv_path: Path, dry_run: bool = False, headless: bool = False, slow_mo: int = 500, name_prefix: str = "", live: bool = False, click_keywords: bool = False, parallel: int = 1):
+    """Main runner for V4 campaign creation.
+
+    With parallel > 1, a config's variants are created concurrently in that
+    many worker browsers (see V4CampaignCreator.create_variants).
+    """
     logger.info("=" * 60)
     logger.info("Campaign Creation V4 — Full-Field Automation")
     logger.info("=" * 60)
@@ -315,7 +319,7 @@ def run_v4(csv_path: Path, dry_run: bool = False, headless: bool = False, slow_m
             return
 
         # Create campaigns
-        creator = V4CampaignCreator(page, name_prefix=name_prefix)
+        creator = V4CampaignCreator(page, name_prefix=name_prefix, click_keywords=click_keywords)
         results = []
         total_created = 0
         total_failed = 0
@@ -330,12 +334,25 @@ def run_v4(csv_path: Path, dry_run: bool = False, headless: bool = False, slow_m
             logger.info(f"  Variants: {', '.join(config.variants)}")
             logger.info(f"{'#' * 60}")
 
+            if parallel > 1 and len(config.variants) > 1:
+                variant_results = creator.create_variants(
+                    config, csv_dir, max_workers=parallel, headless=headless, slow_mo=slow_mo,
+                )
+                for variant, (cid, cname, err) in zip(config.variants, variant_results):
+                    if err is None:
+                        results.append((cid, cname, variant, "Created"))
+                        total_created += 1
+                        continue
+                    logger.error(f"  FAILED [{variant}]: {err}")
+                    if isinstance(err, V4CreationError) and err.orphan_id:
+                        logger.error(f"  ORPHAN CAMPAIGN: {err.orphan_id}")
+                    results.append(("", "", variant, f"FAILED: {err}"))
+                    total_failed += 1
+                continue
+
             for variant in config.variants:
                 try:
-                    if config.template_campaign_id:
-                        cid, cname = creator.clone_from_template(config, variant, csv_dir)
-                    else:
-                        cid, cname = creator.create_campaign(config, variant, csv_dir)
+                    cid, cname = creator.create_variant(config, variant, csv_dir)
                     results.append((cid, cname, variant, "Created"))
                     total_created += 1
                 except (V4CreationError, Exception) as e:
@@ -357,12 +374,9 @@ def run_v4(csv_path: Path, dry_run: bool = False, headless: bool = False, slow_m
                                 total_failed += 1
                                 abort = True
                                 break
-                            creator = V4CampaignCreator(page, name_prefix=name_prefix)
+                            creator = V4CampaignCreator(page, name_prefix=name_prefix, click_keywords=click_keywords)
                             try:
-                                if config.template_campaign_id:
-                                    cid, cname = creator.clone_from_template(config, variant, csv_dir)
-                                else:
-                                    cid, cname = creator.create_campaign(config, variant, csv_dir)
+                                cid, cname = creator.create_variant(config, variant, csv_dir)
                                 results.append((cid, cname, variant, "Created"))
                                 total_created += 1
                                 continue
@@ -435,12 +449,16 @@ Examples:
                         help='Skip creation, just upload ads to an existing campaign')
     parser.add_argument('--live', action='store_true',
                         help='Live mode: auto-recover from browser crashes (used by worker server)')
+    parser.add_argument('--fallback-click-keywords', action='store_true',
+                        help='Add exclude keywords by clicking through select2 instead of a JS batch')
+    parser.add_argument('--parallel', type=int, default=1, metavar='N',
+                        help='Create each campaign\'s variants in N browsers at once (default: 1, sequential)')
 
     args = parser.parse_args()
     if args.upload_only:
         upload_ads_only(Path(args.csv_file), args.upload_only, headless=args.headless, slow_mo=args.slow_mo)
     else:
-        run_v4(Path(args.csv_file), dry_run=args.dry_run, headless=args.headless, slow_mo=args.slow_mo, name_prefix=args.prefix, live=args.live)
+        run_v4(Path(args.csv_file), dry_run=args.dry_run, headless=args.headless, slow_mo=args.slow_mo, name_prefix=args.prefix, live=args.live, click_keywords=args.fallback_click_keywords, parallel=args.parallel)
 
 
 if __name__ == "__main__":
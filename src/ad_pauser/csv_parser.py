@@ -1,14 +1,36 @@
 """CSV parsing for creative IDs and campaign IDs."""
 
+import csv
 import logging
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 import pandas as pd
 from pathlib import Path
-from typing import Set, List, Dict
+from typing import FrozenSet, List, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
-def parse_creative_ids_csv(csv_path: Path) -> Set[str]:
+def _normalize_creative_id(value: str) -> Optional[str]:
+    """
+    Return *value* as a plain digit string, or None if it isn't an integer.
+    
+    Accepts the float forms spreadsheets export for numeric columns
+    ("2212936201.0", "2.212936201E+09") as well as plain digits.
+    """
+    if value.isascii() and value.isdigit():
+        return value
+    try:
+        number = Decimal(value)
+    except InvalidOperation:
+        return None
+    if not number.is_finite() or number != number.to_integral_value() or number < 0:
+        return None
+    return str(int(number))
+
+
+@lru_cache(maxsize=32)
+def parse_creative_ids_csv(csv_path: Path) -> FrozenSet[str]:
     """
     Parse Creative IDs CSV file.
     
@@ -23,7 +45,7 @@ def parse_creative_ids_csv(csv_path: Path) -> Set[str]:
         csv_path: Path to Creative IDs CSV file
         
     Returns:
-        Set of creative IDs as strings
+        Frozen set of creative IDs as strings (cached per path, so immutable)
         
     Raises:
         FileNotFoundError: If CSV file doesn't exist
@@ -35,24 +57,39 @@ def parse_creative_ids_csv(csv_path: Path) -> Set[str]:
         
         logger.info(f"Parsing Creative IDs from: {csv_path}")
         
-        # Read CSV
-        df = pd.read_csv(csv_path)
-        
-        # Check for required column
-        if 'Creative ID' not in df.columns:
-            raise ValueError(
-                f"'Creative ID' column not found in {csv_path.name}. "
-                f"Found columns: {', '.join(df.columns)}"
+        # Stream rows with csv.reader — only one column is needed, so skip
+        # building a DataFrame
+        with open(csv_path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = [h.strip() for h in next(reader, [])]
+            
+            # Check for required column
+            if 'Creative ID' not in header:
+                raise ValueError(
+                    f"'Creative ID' column not found in {csv_path.name}. "
+                    f"Found columns: {', '.join(header)}"
+                )
+            col = header.index('Creative ID')
+            
+            creative_ids = set()
+            rejected = []
+            for row in reader:
+                raw = row[col].strip() if len(row) > col else ''
+                if not raw:
+                    continue  # blank cell
+                cid = _normalize_creative_id(raw)
+                if cid is None:
+                    rejected.append(raw)
+                else:
+                    creative_ids.add(cid)
+        
+        if rejected:
+            logger.warning(
+                f"Skipped {len(rejected)} invalid (non-integer) Creative ID value(s) in "
+                f"{csv_path.name}: {', '.join(rejected[:20])}"
+                + (" ..." if len(rejected) > 20 else "")
             )
-        
-        # Convert to string and remove any NaN values
-        creative_ids = set(
-            str(int(cid)) if pd.notna(cid) else None
-            for cid in df['Creative ID']
-        )
-        
-        # Remove None values
-        creative_ids.discard(None)
+        creative_ids = frozenset(creative_ids)
         
         logger.info(f"✓ Loaded {len(creative_ids)} unique Creative IDs")
         
@@ -66,7 +103,8 @@ def parse_creative_ids_csv(csv_path: Path) -> Set[str]:
         raise
 
 
-def parse_campaign_ids_csv(csv_path: Path) -> List[Dict[str, str]]:
+@lru_cache(maxsize=32)
+def parse_campaign_ids_csv(csv_path: Path) -> Tuple[Dict[str, str], ...]:
     """
     Parse Campaign IDs CSV file.
     
@@ -82,11 +120,12 @@ def parse_campaign_ids_csv(csv_path: Path) -> List[Dict[str, str]]:
         csv_path: Path to Campaign IDs CSV file
         
     Returns:
-        List of dictionaries with campaign information:
-        [
+        Tuple of dictionaries with campaign information (cached per path,
+        so treat as read-only):
+        (
             {'id': '1012927602', 'name': 'Desktop-Stepmom-US', 'notes': ''},
             {'id': '1012927603', 'name': 'iOS-Stepmom-US', 'notes': ''},
-        ]
+        )
         
     Raises:
         FileNotFoundError: If CSV file doesn't exist
@@ -133,7 +172,7 @@ def parse_campaign_ids_csv(csv_path: Path) -> List[Dict[str, str]]:
         if len(campaigns) == 0:
             logger.warning("No valid Campaign IDs found in CSV!")
         
-        return campaigns
+        return tuple(campaigns)
         
     except Exception as e:
         logger.error(f"Failed to parse Campaign IDs CSV: {e}")
@@ -1,29 +1,70 @@
 """Native ad CSV upload automation module."""
 
+import atexit
+import io
 import logging
+import mmap
+import re
 import time
 import csv
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
 
 logger = logging.getLogger(__name__)
 
+# TrafficJunky rejects ad names longer than this
+AD_NAME_MAX_LEN = 64
+# Trailing creative ID kept when truncating ad names (format: ID-XXXXXXXX-VID)
+AD_NAME_ID_PATTERN = re.compile(r'(ID-[A-Za-z0-9]+-[A-Z]+)$')
+
+# Prepared temp CSVs keyed by (source path, mtime, campaign name). Shared by every
+# uploader so retries (and later instances) reuse them; deleted once at exit.
+_CSV_CACHE: Dict[Tuple[Path, int, str], Path] = {}
+
+
+def _cleanup_csv_cache():
+    """Delete temp CSVs created by NativeUploader._update_csv_with_campaign_name."""
+    for temp_path in _CSV_CACHE.values():
+        temp_path.unlink(missing_ok=True)
+    _CSV_CACHE.clear()
+
+
+atexit.register(_cleanup_csv_cache)
+
+# Screenshot PNGs are written off the Playwright thread. One pool for every
+# uploader; its threads are joined (pending writes flushed) at interpreter exit.
+_IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="native-screenshot")
+
+
+def _log_failed_write(filepath: Path):
+    """Done-callback for a queued screenshot write: log it if the write raised."""
+    def _callback(future):
+        exc = future.exception()
+        if exc is not None:
+            logger.warning(f"Screenshot write failed ({filepath.name}): {exc}")
+    return _callback
+
 
 class NativeUploader:
     """Handles Native ad CSV upload to TrafficJunky campaigns."""
     
-    def __init__(self, dry_run: bool = True, take_screenshots: bool = True):
+    def __init__(self, dry_run: bool = True, take_screenshots: bool = True, screenshot_on: str = 'always'):
         """
         Initialize Native uploader.
         
         Args:
             dry_run: If True, simulate but don't actually upload
             take_screenshots: If True, take screenshots at each step
+            screenshot_on: 'always' for every step, 'error' to only capture failures
         """
+        if screenshot_on not in ('always', 'error'):
+            raise ValueError(f"screenshot_on must be 'always' or 'error', got {screenshot_on!r}")
         self.dry_run = dry_run
         self.take_screenshots = take_screenshots
+        self.screenshot_on = screenshot_on
         self.screenshot_counter = 0
     
     def upload_to_campaign(
@@ -171,7 +212,7 @@ class NativeUploader:
         except Exception as e:
             logger.error(f"✗ Native upload failed for campaign {campaign_id}: {e}")
             result['error'] = str(e)
-            self._take_screenshot(page, f"ERROR_native_campaign_{campaign_id}", screenshot_dir)
+            self._take_screenshot(page, f"ERROR_native_campaign_{campaign_id}", screenshot_dir, is_error=True)
             return result
     
     def _navigate_to_campaign(self, page: Page, campaign_id: str) -> bool:
@@ -374,9 +415,8 @@ class NativeUploader:
         try:
             logger.info(f"Uploading Native CSV: {csv_path}")
             
-            # Use set_input_files on the file input
-            file_input = page.locator('#massAdsCsv')
-            file_input.set_input_files(str(csv_path))
+            # Single set_input_files round-trip on the file input (Playwright accepts Path directly)
+            page.set_input_files('#massAdsCsv', csv_path, timeout=10000)
             
             logger.info("✓ Native CSV file uploaded")
             return True
@@ -400,7 +440,6 @@ class NativeUploader:
                 error_text = error_element.text_content()
                 
                 # Extract numbers that look like creative IDs (10+ digits)
-                import re
                 creative_ids = re.findall(r'\d{10,}', error_text)
                 
                 logger.warning(f"Found {len(creative_ids)} invalid creative IDs in Native upload: {creative_ids}")
@@ -571,18 +610,21 @@ class NativeUploader:
                 pass
             return False
     
-    def _take_screenshot(self, page: Page, name: str, screenshot_dir: Optional[Path]):
-        """Take a screenshot if enabled."""
+    def _take_screenshot(self, page: Page, name: str, screenshot_dir: Optional[Path], is_error: bool = False):
+        """Take a screenshot if enabled. The PNG is written to disk on the I/O pool."""
         if not self.take_screenshots or not screenshot_dir:
             return
+        if self.screenshot_on == 'error' and not is_error:
+            return
         
         try:
             screenshot_dir.mkdir(parents=True, exist_ok=True)
             self.screenshot_counter += 1
             filename = f"{self.screenshot_counter:02d}_{name}.png"
             filepath = screenshot_dir / filename
-            page.screenshot(path=str(filepath))
-            logger.debug(f"Screenshot saved: {filename}")
+            png = page.screenshot(type='png', full_page=False)
+            _IO_POOL.submit(filepath.write_bytes, png).add_done_callback(_log_failed_write(filepath))
+            logger.debug(f"Screenshot queued: {filename}")
         except Exception as e:
             logger.debug(f"Screenshot failed: {e}")
     
@@ -600,13 +642,29 @@ class NativeUploader:
             Path to updated temporary CSV file
         """
         try:
-            import re
-            
-            # Read original CSV
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                fieldnames = reader.fieldnames
-                rows = list(reader)
+            # Reuse the temp CSV from a previous attempt if the source hasn't changed
+            cache_key = (csv_path, csv_path.stat().st_mtime_ns, campaign_name)
+            cached = _CSV_CACHE.get(cache_key)
+            if cached and cached.exists():
+                logger.info(f"✓ Reusing prepared Native CSV: {cached}")
+                return cached
+            
+            # Read raw bytes once (mmap avoids an extra buffered copy on large CSVs)
+            data = self._read_csv_bytes(csv_path)
+            text = data.decode('utf-8')
+            
+            # Fast path: nothing to truncate -> byte-for-byte copy, no DictReader/DictWriter pass
+            if not self._ad_names_need_truncation(text):
+                with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as temp_file:
+                    temp_path = Path(temp_file.name)
+                temp_path.write_bytes(data)
+                _CSV_CACHE[cache_key] = temp_path
+                logger.info(f"✓ Prepared Native CSV for upload (no ad names over {AD_NAME_MAX_LEN} chars)")
+                return temp_path
+            
+            reader = csv.DictReader(io.StringIO(text, newline=''))
+            fieldnames = reader.fieldnames
+            rows = list(reader)
             
             # Create temporary file
             temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, encoding='utf-8')
@@ -625,25 +683,29 @@ class NativeUploader:
                         if len(ad_name) > 64:
                             # Try to extract ID pattern (ID-XXXXXXXX-VID or similar)
                             # Match alphanumeric ID with format: ID-<alphanumeric>-<letters>
-                            id_match = re.search(r'(ID-[A-Za-z0-9]+-[A-Z]+)$', ad_name)
+                            id_match = AD_NAME_ID_PATTERN.search(ad_name)
                             if id_match:
                                 id_part = id_match.group(1)
                                 # Truncate the beginning but keep the ID
                                 max_prefix_len = 64 - len(id_part) - 1  # -1 for underscore
                                 prefix = ad_name[:max_prefix_len]
                                 row['Ad Name'] = f"{prefix}_{id_part}"
-                                logger.info(f"Truncated ad name from {len(ad_name)} to 64 chars (kept ID): {row['Ad Name']}")
+                                if logger.isEnabledFor(logging.INFO):
+                                    logger.info("Truncated ad name from %d to 64 chars (kept ID): %s", len(ad_name), row['Ad Name'])
                             else:
                                 # No ID pattern found, just truncate
                                 row['Ad Name'] = ad_name[:64]
-                                logger.info(f"Truncated ad name to 64 chars (no ID pattern): {row['Ad Name']}")
-                        else:
-                            logger.debug(f"Ad name OK ({len(ad_name)} chars): {ad_name}")
+                                if logger.isEnabledFor(logging.INFO):
+                                    logger.info("Truncated ad name to 64 chars (no ID pattern): %s", row['Ad Name'])
+                        elif logger.isEnabledFor(logging.DEBUG):
+                            # Per-row hot path: skip formatting unless debug logging is on
+                            logger.debug("Ad name OK (%d chars): %s", len(ad_name), ad_name)
                     
                     # Preserve Target URL as-is — TJ macros like {CampaignName} are resolved at serve-time
                     
                     writer.writerow(row)
             
+            _CSV_CACHE[cache_key] = temp_path
             logger.info(f"✓ Prepared Native CSV for upload (ad name truncation check done)")
             return temp_path
             
@@ -651,4 +713,22 @@ class NativeUploader:
             logger.warning(f"Failed to update Native CSV with campaign name: {e}")
             # Return original path if update fails
             return csv_path
-
+    
+    @staticmethod
+    def _read_csv_bytes(csv_path: Path) -> bytes:
+        """Read the whole CSV as bytes via mmap (falls back to a plain read for empty files)."""
+        with open(csv_path, 'rb') as f:
+            if csv_path.stat().st_size == 0:
+                return f.read()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return bytes(mm)
+    
+    @staticmethod
+    def _ad_names_need_truncation(text: str) -> bool:
+        """Return True if any 'Ad Name' value exceeds the TrafficJunky length limit."""
+        reader = csv.reader(io.StringIO(text, newline=''))
+        header = next(reader, None)
+        if not header or 'Ad Name' not in header:
+            return False
+        idx = header.index('Ad Name')
+        return any(len(row) > idx and len(row[idx]) > AD_NAME_MAX_LEN for row in reader)
@@ -1,11 +1,17 @@
 """V4 Campaign Creator — main orchestrator for the 5-step flow."""
 
 import logging
-from typing import Tuple
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 from playwright.sync_api import Page
 
 from .models import V4CampaignConfig
-from .utils import click_save_and_continue, check_session, dismiss_modals, set_radio
+from .utils import (
+    check_session, dismiss_modals, set_radio, wait_stable, wait_for_step,
+    save_and_wait_step, wait_for_select2_ready,
+)
 from .steps import step1_basic_settings as step1
 from .steps import step2_geo_audience as step2
 from .steps import step3_tracking_sources as step3
@@ -24,6 +30,16 @@ logger = logging.getLogger(__name__)
 
 BASE_URL = "https://advertiser.trafficjunky.com"
 
+# Live (non-draft) campaign IDs are 10+ digits
+LIVE_ID_IN_URL_RE = re.compile(r'/campaign/(\d{10,})')
+LIVE_ID_SEGMENT_RE = re.compile(r'/campaign/(\d{10,})(?:/|$|\?)')
+LIVE_ID_OVERVIEW_RE = re.compile(r'/campaign/(?:overview/)?(\d{10,})')
+
+# Campaign naming lookups used by _build_name
+AD_FORMAT_NAME_MAP = {"display": "NATIVE", "instream": "INSTREAM", "pop": "POP"}
+DEVICE_ABBR_MAP = {"desktop": "DESK", "ios": "iOS", "android": "AND", "all_mobile": "MOB_ALL"}
+GENDER_ABBR_MAP = {"male": "M", "female": "F", "all": "MF"}
+
 
 class V4CreationError(Exception):
     """Raised when V4 campaign creation fails."""
@@ -37,9 +53,11 @@ class V4CreationError(Exception):
 class V4CampaignCreator:
     """Creates campaigns from scratch using the 5-step TJ flow."""
 
-    def __init__(self, page: Page, name_prefix: str = ""):
+    def __init__(self, page: Page, name_prefix: str = "", click_keywords: bool = False):
         self.page = page
         self.name_prefix = name_prefix
+        # Add exclude keywords through the select2 UI one by one instead of a JS batch
+        self.click_keywords = click_keywords
 
     def create_campaign(
         self,
@@ -69,11 +87,7 @@ class V4CampaignCreator:
                 wait_until="domcontentloaded",
                 timeout=60000,
             )
-            try:
-                self.page.wait_for_load_state("networkidle", timeout=15000)
-            except Exception:
-                pass
-            import time as _t; _t.sleep(2)
+            wait_for_step(self.page, 1, timeout=20000)
 
             # ── Step 1: Basic Settings ────────────────────────────
             if not check_session(self.page):
@@ -81,6 +95,7 @@ class V4CampaignCreator:
             campaign_id = step1.configure_step1(
                 self.page, config, campaign_name, variant
             )
+            wait_for_step(self.page, 2)
 
             # ── Step 2: Geo & Audience ────────────────────────────
             if not check_session(self.page):
@@ -88,47 +103,44 @@ class V4CampaignCreator:
             step2.configure_step2(self.page, config, variant)
 
             # Step 2 also handles keywords — save & continue past it
-            _handle_keywords(self.page, config)
+            _handle_keywords(self.page, config, self.click_keywords)
             logger.info(f"  [Nav] Step 2 done, URL before save: {self.page.url}")
-            click_save_and_continue(self.page)
+            save_and_wait_step(self.page, 3)
             logger.info(f"  [Nav] After step 2 save, URL: {self.page.url}")
 
             # ── Step 3: Tracking & Sources ────────────────────────
             if not check_session(self.page):
                 raise V4CreationError("Session expired before Step 3", orphan_id=campaign_id)
-            import time as _time; _time.sleep(2)
             step3.configure_step3(self.page, config)
             logger.info(f"  [Nav] Step 3 done, URL before save: {self.page.url}")
-            click_save_and_continue(self.page)
+            save_and_wait_step(self.page, 4)
             logger.info(f"  [Nav] After step 3 save, URL: {self.page.url}")
 
             # ── Step 4: Schedule & Budget ─────────────────────────
             if not check_session(self.page):
                 raise V4CreationError("Session expired before Step 4", orphan_id=campaign_id)
-            import time as _time; _time.sleep(2)
             step4.configure_step4(self.page, config)
             logger.info(f"  [Nav] Step 4 done, URL before save: {self.page.url}")
-            click_save_and_continue(self.page)
+            save_and_wait_step(self.page, 5)
             logger.info(f"  [Nav] After step 4 save, URL: {self.page.url}")
 
             # ── Step 5: Ad Settings ───────────────────────────────
             if not check_session(self.page):
                 raise V4CreationError("Session expired before Step 5", orphan_id=campaign_id)
-            import time as _time; _time.sleep(2)
             logger.info(f"  [Nav] Starting step 5, URL: {self.page.url}")
             step5.configure_step5(self.page, config, csv_dir, campaign_name)
 
             # After finalization, get the LIVE campaign ID.
             # Wait for TJ to register, then use the campaigns filter to find it.
-            import time as _t2; _t2.sleep(5)
+            time.sleep(5)
             try:
                 # Re-establish page context (may have been destroyed during finish)
                 try:
                     self.page.goto(f"{BASE_URL}/campaigns?campaignTab=bid",
                                    wait_until="domcontentloaded", timeout=20000)
-                    _t2.sleep(3)
+                    time.sleep(3)
                 except Exception:
-                    _t2.sleep(3)
+                    time.sleep(3)
 
                 live_id = self._extract_live_id(campaign_id, campaign_name)
                 if live_id and live_id != campaign_id:
@@ -151,6 +163,95 @@ class V4CampaignCreator:
                 f"Failed to create campaign: {e}", orphan_id=campaign_id
             ) from e
 
+    def create_variant(self, config: V4CampaignConfig, variant: str, csv_dir: str) -> Tuple[str, str]:
+        """Create one variant — cloned when template_campaign_id is set, else from scratch."""
+        if config.template_campaign_id:
+            return self.clone_from_template(config, variant, csv_dir)
+        return self.create_campaign(config, variant, csv_dir)
+
+    def create_variants(
+        self,
+        config: V4CampaignConfig,
+        csv_dir: str,
+        max_workers: int = 3,
+        headless: bool = True,
+        slow_mo: int = 0,
+    ) -> List[Tuple[str, str, Optional[Exception]]]:
+        """
+        Create every variant of *config* concurrently, one browser per worker.
+
+        Playwright's sync API is bound to the thread that started it, so each
+        worker runs its own Playwright + browser (launched with *headless* and
+        *slow_mo*) and reuses this page's logged-in session via its storage
+        state. A worker keeps that browser for all of its variants, opening a
+        new page in one shared context for each. The per-variant flow is
+        create_variant, unchanged.
+
+        Returns:
+            [(campaign_id, campaign_name, error), ...] in config.variants order.
+            error is None on success; on failure the ID and name are empty and
+            error holds the exception, so one failed variant never hides the
+            campaigns the other workers created.
+        """
+        from playwright.sync_api import sync_playwright
+
+        variants = list(config.variants)
+        if len(variants) <= 1 or max_workers <= 1:
+            return [self._try_create_variant(self, config, v, csv_dir) for v in variants]
+
+        storage_state = self.page.context.storage_state()
+        n_workers = min(max_workers, len(variants))
+        results: List[Optional[Tuple[str, str, Optional[Exception]]]] = [None] * len(variants)
+
+        def _create_share(indices: List[int]):
+            # One browser + context per worker; a fresh page per variant
+            try:
+                with sync_playwright() as p:
+                    browser = p.chromium.launch(headless=headless, slow_mo=slow_mo)
+                    try:
+                        context = browser.new_context(
+                            storage_state=storage_state,
+                            viewport={'width': 1920, 'height': 1080},
+                        )
+                        for i in indices:
+                            page = context.new_page()
+                            page.set_default_timeout(30000)
+                            try:
+                                creator = V4CampaignCreator(page, self.name_prefix, self.click_keywords)
+                                results[i] = self._try_create_variant(creator, config, variants[i], csv_dir)
+                            finally:
+                                page.close()
+                    finally:
+                        browser.close()
+            except Exception as e:
+                # Browser launch/teardown failed — every variant it hadn't finished fails
+                logger.error(f"  Worker browser failed: {e}")
+                for i in indices:
+                    if results[i] is None:
+                        results[i] = ("", "", e)
+
+        # Round-robin the variants so each worker launches Chromium only once
+        shares = [list(range(w, len(variants), n_workers)) for w in range(n_workers)]
+        logger.info(f"  Creating {len(variants)} variants in parallel ({n_workers} workers)")
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            for future in [pool.submit(_create_share, share) for share in shares]:
+                future.result()
+        return results
+
+    @staticmethod
+    def _try_create_variant(
+        creator: "V4CampaignCreator",
+        config: V4CampaignConfig,
+        variant: str,
+        csv_dir: str,
+    ) -> Tuple[str, str, Optional[Exception]]:
+        """Run create_variant, returning the error instead of raising it."""
+        try:
+            cid, cname = creator.create_variant(config, variant, csv_dir)
+            return cid, cname, None
+        except Exception as e:
+            return "", "", e
+
     def clone_from_template(
         self,
         config: V4CampaignConfig,
@@ -171,7 +272,6 @@ class V4CampaignCreator:
         Returns:
             (campaign_id, campaign_name)
         """
-        import time as _t
         from .steps.step1_basic_settings import GENDER_MAP
 
         template_id = config.template_campaign_id
@@ -199,7 +299,7 @@ class V4CampaignCreator:
             wait_until="domcontentloaded",
             timeout=30000,
         )
-        _t.sleep(5)
+        time.sleep(5)
         dismiss_modals(self.page)
 
         # Campaign name
@@ -224,7 +324,7 @@ class V4CampaignCreator:
 
         # Content category (editable on live campaigns via radio)
         if config.content_category:
-            set_radio(self.page, "content_category_id", config.content_category.lower())
+            set_radio(self.page, "content_category_id", config.content_category)
             logger.info(f"    Content category: {config.content_category}")
 
         # Labels (auto-generate from keyword_name + explicit labels)
@@ -264,7 +364,7 @@ class V4CampaignCreator:
             wait_until="domcontentloaded",
             timeout=30000,
         )
-        _t.sleep(5)
+        wait_for_step(self.page, 2, timeout=10000)
         dismiss_modals(self.page)
 
         # Geo & all toggle-gated targeting (OS, browser, language, etc.)
@@ -272,12 +372,11 @@ class V4CampaignCreator:
         step2.configure_step2(self.page, config, variant)
 
         # Keywords (separate from step2 — handled after geo/targeting)
-        _handle_keywords(self.page, config)
+        _handle_keywords(self.page, config, self.click_keywords)
 
         # Wait for keyword bulk-add to fully commit before saving
         if config.keywords:
-            import time as _tw
-            _tw.sleep(2)
+            time.sleep(2)
 
         # Save audience page — may trigger "Match Suggested CPM" modal
         self._save_audience_page()
@@ -287,7 +386,7 @@ class V4CampaignCreator:
         needs_step3 = bool(
             config.tracker_id
             or config.smart_bidder
-            or (config.source_selection and config.source_selection.upper() != "ALL")
+            or config.source_terms
         )
 
         if needs_step3:
@@ -299,7 +398,7 @@ class V4CampaignCreator:
                 wait_until="domcontentloaded",
                 timeout=30000,
             )
-            _t.sleep(5)
+            wait_for_step(self.page, 3, timeout=10000)
             dismiss_modals(self.page)
 
             step3.configure_step3(self.page, config)
@@ -328,7 +427,7 @@ class V4CampaignCreator:
                 wait_until="domcontentloaded",
                 timeout=30000,
             )
-            _t.sleep(5)
+            wait_for_step(self.page, 4, timeout=10000)
             dismiss_modals(self.page)
 
             step4.configure_step4(self.page, config)
@@ -348,7 +447,7 @@ class V4CampaignCreator:
                 wait_until="domcontentloaded",
                 timeout=30000,
             )
-            _t.sleep(5)
+            wait_for_step(self.page, 5, timeout=10000)
             dismiss_modals(self.page)
 
             step5.configure_step5(self.page, config, csv_dir, campaign_name)
@@ -364,13 +463,12 @@ class V4CampaignCreator:
 
     def _pause_campaign(self, campaign_id: str):
         """Pause a campaign by navigating to its page and clicking the pause control."""
-        import time as _t
         try:
             self.page.goto(
                 f"{BASE_URL}/campaign/{campaign_id}",
                 wait_until="domcontentloaded", timeout=15000,
             )
-            _t.sleep(3)
+            time.sleep(3)
 
             # Click the pause icon (fa-pause) on the campaign page
             paused = self.page.evaluate('''() => {
@@ -393,7 +491,7 @@ class V4CampaignCreator:
                 if (playIcon) return "already_paused";
                 return "no_pause_control";
             }''')
-            _t.sleep(1)
+            time.sleep(1)
 
             # Confirm any dialog
             self.page.evaluate('''() => {
@@ -401,7 +499,7 @@ class V4CampaignCreator:
                     if (b.textContent.trim().match(/yes|ok|confirm/i)) b.click();
                 });
             }''')
-            _t.sleep(1)
+            time.sleep(1)
             logger.info(f"    Campaign paused: {paused}")
         except Exception as e:
             logger.warning(f"    Could not pause campaign: {e}")
@@ -413,7 +511,6 @@ class V4CampaignCreator:
         or stay on the same page (Update). Handle both cases gracefully.
         After saving, TJ may show a "Match Suggested CPM" modal — dismiss it.
         """
-        import time as _t
 
         # Use "Save & Continue" (confirmAudience) which persists keywords and
         # toggle sections. "Save Changes" (#saveChanges) doesn't persist
@@ -442,8 +539,7 @@ class V4CampaignCreator:
             logger.warning("    No audience save button found")
             return
 
-        import time as _t
-        _t.sleep(5)
+        time.sleep(5)
 
         # Handle "Match Suggested CPM" modal if it appears
         for _ in range(10):
@@ -473,9 +569,9 @@ class V4CampaignCreator:
             except Exception:
                 logger.info("    Audience save completed (page navigated)")
                 return
-            _t.sleep(1)
+            time.sleep(1)
 
-        _t.sleep(1)
+        time.sleep(1)
         try:
             dismiss_modals(self.page)
         except Exception:
@@ -484,7 +580,6 @@ class V4CampaignCreator:
     @staticmethod
     def _save_draft_step(page: Page):
         """Save the current draft step by clicking any available save button."""
-        import time as _t
         saved = page.evaluate('''() => {
             // Try all save button variants
             const selectors = [
@@ -506,7 +601,7 @@ class V4CampaignCreator:
             }
             return null;
         }''')
-        _t.sleep(5)
+        time.sleep(5)
         if saved:
             logger.info(f"    Saved via: {saved}")
         else:
@@ -514,31 +609,30 @@ class V4CampaignCreator:
 
     def _clone_campaign(self, template_id: str) -> str:
         """Clone a campaign via the TJ UI and return the new draft ID."""
-        import time as _t
 
         self.page.goto(f"{BASE_URL}/campaigns", wait_until="domcontentloaded", timeout=15000)
-        _t.sleep(3)
+        time.sleep(3)
 
         # Open filters
         self.page.click("button.toggleCampaignsFilter", timeout=5000)
-        _t.sleep(1)
+        time.sleep(1)
 
         # Search for template by ID
         campaign_select = self.page.locator(
             '#campaign + .select2-container, span[aria-labelledby="select2-campaign-container"]'
         )
         campaign_select.click(timeout=5000)
-        _t.sleep(0.5)
+        time.sleep(0.5)
 
         search_input = self.page.locator('.select2-container--open .select2-search__field')
         search_input.fill(template_id)
-        _t.sleep(2)
+        time.sleep(2)
 
         self.page.locator('li.select2-results__option').first.click(timeout=5000)
-        _t.sleep(0.5)
+        time.sleep(0.5)
 
         self.page.locator('button#applyFilters').click(timeout=5000)
-        _t.sleep(3)
+        time.sleep(3)
 
         # Hover row and click clone icon
         clone_icon = self.page.locator(f'i.campaignIconAction.clone[data-campaign-id="{template_id}"]')
@@ -548,10 +642,10 @@ class V4CampaignCreator:
         # Hover parent row first
         row = clone_icon.locator("xpath=ancestor::tr").first
         row.hover(timeout=5000)
-        _t.sleep(0.5)
+        time.sleep(0.5)
 
         clone_icon.first.click(force=True, no_wait_after=True, timeout=5000)
-        _t.sleep(2)
+        time.sleep(2)
 
         # Wait for redirect to new campaign
         self.page.wait_for_url(f"{BASE_URL}/campaign/**", timeout=30000)
@@ -569,13 +663,11 @@ class V4CampaignCreator:
         Strategy: load campaign overview with draft ID — TJ may redirect to live ID,
         or the overview page may contain the external campaign ID.
         """
-        import time as _t
-        import re
 
         # Method 1: Check current URL for live ID
         try:
             url = self.page.url
-            match = re.search(r'/campaign/(\d{10,})', url)
+            match = LIVE_ID_IN_URL_RE.search(url)
             if match and "/drafts/" not in url:
                 return match.group(1)
         except Exception:
@@ -585,9 +677,9 @@ class V4CampaignCreator:
         try:
             self.page.goto(f"{BASE_URL}/campaign/{draft_id}",
                           wait_until="domcontentloaded", timeout=15000)
-            _t.sleep(3)
+            time.sleep(3)
             url = self.page.url
-            match = re.search(r'/campaign/(\d{10,})(?:/|$|\?)', url)
+            match = LIVE_ID_SEGMENT_RE.search(url)
             if match and "/drafts/" not in url:
                 live_id = match.group(1)
                 # Verify it's OUR campaign by checking the name on the page
@@ -607,9 +699,9 @@ class V4CampaignCreator:
         try:
             self.page.goto(f"{BASE_URL}/campaign/overview/{draft_id}",
                           wait_until="domcontentloaded", timeout=15000)
-            _t.sleep(3)
+            time.sleep(3)
             url = self.page.url
-            match = re.search(r'/campaign/(?:overview/)?(\d{10,})', url)
+            match = LIVE_ID_OVERVIEW_RE.search(url)
             if match:
                 live_id = match.group(1)
                 # Verify name from overview page
@@ -645,8 +737,7 @@ class V4CampaignCreator:
     def _build_name(self, config: V4CampaignConfig, variant: str) -> str:
         """Generate the campaign name using the shared naming function."""
         # Determine ad_format for naming (NATIVE / INSTREAM)
-        ad_format_name_map = {"display": "NATIVE", "instream": "INSTREAM", "pop": "POP"}
-        ad_format = ad_format_name_map.get(config.ad_format_type, "NATIVE")
+        ad_format = AD_FORMAT_NAME_MAP.get(config.ad_format_type, "NATIVE")
         ad_format_name = "PREROLL" if ad_format == "INSTREAM" else ad_format
         # Distinguish Native from Banner (both are ad_format_type=display)
         if config.ad_format_type == "display" and config.format_type == "banner":
@@ -658,17 +749,15 @@ class V4CampaignCreator:
         if mobile_combined and variant.lower() in ("ios", "android", "all_mobile"):
             device_abbr = "MOB_ALL"
         else:
-            device_map = {"desktop": "DESK", "ios": "iOS", "android": "AND", "all_mobile": "MOB_ALL"}
-            device_abbr = device_map.get(variant.lower(), variant.upper())
+            device_abbr = DEVICE_ABBR_MAP.get(variant.lower(), variant.upper())
 
         # Gender abbreviation
-        gender_map = {"male": "M", "female": "F", "all": "MF"}
-        gender_abbr = gender_map.get(config.gender.lower(), "M")
+        gender_abbr = GENDER_ABBR_MAP.get(config.gender, "M")
 
         # If keyword_name has KEY-/INT- prefix, use direct naming pattern
         # e.g. Gold_ALL_PH_PREROLL_CPM_KEY-Hentai_iOS_M_JB
         pk = config.primary_keyword
-        cat = config.content_category.lower()
+        cat = config.content_category
 
         if cat == "gay":
             targeting = "Gay"
@@ -691,12 +780,11 @@ class V4CampaignCreator:
         return name
 
 
-def _handle_keywords(page: Page, config: V4CampaignConfig):
+def _handle_keywords(page: Page, config: V4CampaignConfig, click_keywords: bool = False):
     """Configure keyword targeting on the geo/audience page (before save)."""
     if not config.keywords:
         return
 
-    import time
 
     try:
         # Enable keyword targeting toggle first
@@ -717,21 +805,17 @@ def _handle_keywords(page: Page, config: V4CampaignConfig):
             }
             return "not_found";
         }''')
-        time.sleep(1)
         logger.info("    Keyword targeting toggle enabled")
 
         # Wait for keyword section to become visible
-        try:
-            page.wait_for_selector('span[id="select2-keyword_select-container"]',
-                                   state="visible", timeout=5000)
-        except Exception:
-            time.sleep(2)
+        wait_stable(page, 'span[id="select2-keyword_select-container"]', timeout=5000)
 
         # Remove existing keywords
-        remove_all = page.locator('a.removeAllKeywords[data-selection-type="include"]')
-        if remove_all.count() > 0 and remove_all.first.is_visible(timeout=2000):
-            remove_all.first.click()
-            time.sleep(0.5)
+        remove_all = page.query_selector('a.removeAllKeywords[data-selection-type="include"]')
+        if remove_all and remove_all.is_visible():
+            remove_all.click()
+            wait_stable(page, '#keyword_select + .select2-container .select2-selection__choice',
+                        timeout=2000, state="detached")
 
         # Parse match types: "broad,broad,broad,broad" → first N are broad, rest exact
         match_types_str = config.match_type or ""
@@ -749,26 +833,22 @@ def _handle_keywords(page: Page, config: V4CampaignConfig):
         bulk_btn = page.query_selector('button.bulkAddButton')
         if bulk_btn:
             bulk_btn.click()
-            time.sleep(0.5)
         else:
             page.click('button:has-text("Bulk add")', timeout=3000)
-            time.sleep(0.5)
+        wait_stable(page, 'textarea.bulkTextField')
 
         textarea = page.query_selector('textarea.bulkTextField[data-type="include"]')
         if textarea:
             textarea.fill(bulk_text)
-            time.sleep(0.3)
         else:
             page.fill('textarea.bulkTextField', bulk_text)
-            time.sleep(0.3)
 
         include_btn = page.query_selector('button#saveBulkKeywordList[data-type="include"]')
         if include_btn:
             include_btn.click()
-            time.sleep(0.5)
         else:
             page.click('button#saveBulkKeywordList', timeout=3000)
-            time.sleep(0.5)
+        wait_stable(page, 'textarea.bulkTextField', state="hidden")
 
         broad_count = sum(1 for i in range(len(config.keywords)) if i < len(match_list) and match_list[i] == "broad")
         exact_count = len(config.keywords) - broad_count
@@ -781,17 +861,17 @@ def _handle_keywords(page: Page, config: V4CampaignConfig):
     keywords_exclude = getattr(config, 'keywords_exclude', [])
     logger.info(f"    Keyword exclude check: {keywords_exclude}")
     if keywords_exclude:
-        _handle_keywords_exclude(page, keywords_exclude)
+        _handle_keywords_exclude(page, keywords_exclude, click_keywords)
 
 
-def _handle_keywords_exclude(page: Page, keywords_exclude: list):
-    """Add exclude keywords via the bulk add exclude UI.
+def _handle_keywords_exclude(page: Page, keywords_exclude: list, click_keywords: bool = False):
+    """Add exclude keywords to the #keyword_exclude select2.
 
-    TJ has separate include/exclude keyword sections. The exclude section
-    uses the same bulk-add pattern but with data-type='exclude' attributes.
-    If the separate exclude UI isn't available, fall back to the select2 approach.
+    By default all keywords are injected as selected <option>s in one JS call
+    and select2 is notified once. If that isn't possible (select or jQuery
+    missing, or not every keyword ended up selected) — or *click_keywords* is
+    set — fall back to searching and clicking each keyword in the select2 UI.
     """
-    import time
 
     try:
         # Scroll to keyword exclude section
@@ -808,10 +888,29 @@ def _handle_keywords_exclude(page: Page, keywords_exclude: list):
         }''')
         time.sleep(0.5)
 
-        # Build bulk text (all exact for excludes)
-        bulk_text = "\n".join(keywords_exclude)
+        if not click_keywords:
+            injected = page.evaluate('''(keywords) => {
+                const sel = document.querySelector("#keyword_exclude");
+                if (!sel || typeof jQuery === "undefined") return -1;
+                for (const kw of keywords) {
+                    let opt = Array.from(sel.options).find(o => o.value === kw);
+                    if (!opt) { opt = new Option(kw, kw, true, true); sel.appendChild(opt); }
+                    opt.selected = true;
+                }
+                jQuery(sel).trigger("change");
+                const selected = new Set(Array.from(sel.selectedOptions, o => o.value));
+                return keywords.filter(kw => selected.has(kw)).length;
+            }''', keywords_exclude)
+            if injected == len(keywords_exclude):
+                logger.info(f"    Excluded {injected} keywords via JS batch")
+                return
+            logger.info(f"    JS keyword batch unavailable ({injected}) — adding excludes via select2 UI")
 
         # Add exclude keywords one-by-one via select2 #keyword_exclude
+        # Locators are lazy — build them once and re-resolve them per keyword
+        search = page.locator('.select2-container--open .select2-search__field')
+        first_result = page.locator('li.select2-results__option:not(.loading-results)').first
+
         added = 0
         for kw in keywords_exclude:
             try:
@@ -822,16 +921,15 @@ def _handle_keywords_exclude(page: Page, keywords_exclude: list):
                     const s2 = document.querySelector('#select2-keyword_exclude-container');
                     if (s2) s2.click();
                 }''')
-                time.sleep(0.5)
+                wait_stable(page, '.select2-container--open .select2-search__field')
 
                 # Type keyword in search
-                search = page.locator('.select2-container--open .select2-search__field')
                 search.fill(kw)
-                time.sleep(1.5)
+                wait_for_select2_ready(page, "select2-keyword_exclude-results")
 
                 # Click first matching result
-                page.locator('li.select2-results__option').first.click(timeout=5000)
-                time.sleep(0.5)
+                first_result.click(timeout=5000)
+                wait_stable(page, '.select2-container--open', state="hidden")
                 added += 1
             except Exception as e:
                 logger.warning(f"    Could not add exclude keyword '{kw}': {e}")
@@ -3,9 +3,17 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import itertools
+import json
 import logging
+import os
+import re
+from dataclasses import asdict, fields
 from pathlib import Path
-from typing import List, Union
+from typing import Iterator, List, Union
+
+import pandas as pd
 
 from .models import V4CampaignConfig
 
@@ -16,28 +24,88 @@ class V4CSVParseError(Exception):
     """Raised when the V4 CSV file cannot be parsed or is invalid."""
 
 
+# Parsed configs are cached as plain JSON dicts in a tool-owned directory (never
+# next to user data, and never unpickled). The key holds the CSV's mtime/size, the
+# model's field names and _PARSER_VERSION — bump it whenever parsing or value
+# normalization changes so caches written by the old code are ignored.
+_PARSER_VERSION = 2
+_CACHE_DIR = Path(os.getenv("TJ_TOOL_CACHE_DIR", Path.home() / ".cache" / "tj_tool")) / "v4_csv"
+_MODEL_FIELDS = [f.name for f in fields(V4CampaignConfig)]
+
+
+def _cache_path(csv_path: Path) -> Path:
+    digest = hashlib.sha1(str(csv_path.resolve()).encode("utf-8")).hexdigest()
+    return _CACHE_DIR / f"{digest}.json"
+
+
+def _cache_key(csv_path: Path) -> dict:
+    st = csv_path.stat()
+    return {
+        "version": _PARSER_VERSION,
+        "path": str(csv_path.resolve()),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "fields": _MODEL_FIELDS,
+    }
+
+
+def _load_cached(csv_path: Path):
+    try:
+        with open(_cache_path(csv_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("key") != _cache_key(csv_path):
+            return None
+        return [V4CampaignConfig(**row) for row in data["configs"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_cached(csv_path: Path, configs: List[V4CampaignConfig]):
+    cache_path = _cache_path(csv_path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": _cache_key(csv_path), "configs": [asdict(c) for c in configs]}, f)
+        tmp_path.replace(cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Could not write parse cache for {csv_path.name}: {e}")
+
+
+_TRUE_VALUES = frozenset({"TRUE", "1", "YES", "Y"})
+# Plain decimals ("5", "-0.30", ".5") — the overwhelmingly common case in CSVs
+_PLAIN_NUMBER_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)")
+
+
 def _bool(val: str) -> bool:
-    return val.strip().upper() in ("TRUE", "1", "YES", "Y")
+    return val.strip().upper() in _TRUE_VALUES
 
 
-def _float(val: str, default: float) -> float:
-    val = val.strip()
-    if not val:
-        return default
+def _to_float(val: str):
+    """float(val) for a stripped value, or None if it isn't a number."""
+    if _PLAIN_NUMBER_RE.fullmatch(val):
+        return float(val)
+    # Rare forms float() still accepts (exponents, "inf", "1_000")
     try:
         return float(val)
     except ValueError:
+        return None
+
+
+def _float(val: str, default: float) -> float:
+    val = val.strip()
+    if not val:
         return default
+    num = _to_float(val)
+    return default if num is None else num
 
 
 def _int(val: str, default: int) -> int:
     val = val.strip()
     if not val:
         return default
-    try:
-        return int(float(val))
-    except ValueError:
-        return default
+    num = _to_float(val)
+    return default if num is None else int(num)
 
 
 def _list(val: str, sep: str = ",") -> List[str]:
@@ -56,16 +124,53 @@ def _optional_float(val: str):
     val = val.strip()
     if not val:
         return None
+    return _to_float(val)
+
+
+def _strip_row(row: dict) -> dict:
+    """Strip a csv.DictReader row, dropping the None key it files extra fields under."""
+    return {k: (v or "").strip() for k, v in row.items() if k is not None}
+
+
+def _iter_rows(csv_path: Path, chunksize: int = 500) -> Iterator[dict]:
+    """Yield CSV rows as dicts with every value stripped.
+
+    The strip runs as one vectorized pandas string op over whole columns
+    (read *chunksize* rows at a time) instead of per field in Python; case
+    normalization is left to V4CampaignConfig.__post_init__. Malformed
+    files that pandas rejects (ragged rows, no data) fall back to
+    csv.DictReader, which is more lenient, resuming after any rows already yielded.
+    """
+    yielded = 0
     try:
-        return float(val)
-    except ValueError:
-        return None
+        # index_col=False: a row with a trailing extra field (e.g. "G1,a.csv,")
+        # must not make the first column the index and shift every value left.
+        # Selecting the header's columns drops the extra field (csv.DictReader
+        # filed it under a None key that nothing read).
+        with pd.read_csv(csv_path, dtype=str, keep_default_na=False, index_col=False,
+                         usecols=lambda col: True, encoding="utf-8-sig",
+                         chunksize=chunksize) as chunks:
+            for chunk in chunks:
+                for row in chunk.apply(lambda col: col.str.strip()).to_dict("records"):
+                    yield row
+                    yielded += 1
+        return
+    except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        logger.debug(f"pandas could not read {csv_path.name} ({e}) — using csv.DictReader")
+
+    with open(csv_path, "r", newline="", encoding="utf-8-sig") as f:
+        for row in itertools.islice(csv.DictReader(f), yielded, None):
+            yield _strip_row(row)
 
 
 def _row_to_config(row: dict, row_num: int) -> V4CampaignConfig:
-    """Convert one CSV row (dict) into a V4CampaignConfig."""
+    """Convert one stripped CSV row (dict) into a V4CampaignConfig.
+
+    Enum-like fields are passed through as written; V4CampaignConfig
+    canonicalizes their case.
+    """
     def g(key: str, default: str = "") -> str:
-        return row.get(key, default).strip() if row.get(key) else default
+        return row.get(key) or default
 
     # Required fields
     group = g("group")
@@ -89,23 +194,23 @@ def _row_to_config(row: dict, row_num: int) -> V4CampaignConfig:
         enabled=_bool(g("enabled", "TRUE")),
         group=group,
         keywords=_list(g("keywords")),
-        match_type=g("match_type", "exact").lower(),
+        match_type=g("match_type", "exact"),
         geo=_list(g("geo", "US")),
         variants=_list(g("variants", "desktop")),
         csv_file=csv_file,
 
         # Step 1
-        language=g("language", "EN").upper(),
-        bid_type=g("bid_type", "CPA").upper(),
-        campaign_type=g("campaign_type", "Standard").title(),
-        content_rating=g("content_rating", "NSFW").upper(),
+        language=g("language", "EN"),
+        bid_type=g("bid_type", "CPA"),
+        campaign_type=g("campaign_type", "Standard"),
+        content_rating=g("content_rating", "NSFW"),
         device=g("device", ""),
-        ad_format_type=g("ad_format_type", "display").lower(),
-        format_type=g("format_type", "native").lower(),
-        ad_type=g("ad_type", "rollover").lower(),
+        ad_format_type=g("ad_format_type", "display"),
+        format_type=g("format_type", "native"),
+        ad_type=g("ad_type", "rollover"),
         ad_dimensions=g("ad_dimensions", "300x250"),
-        content_category=g("content_category", "straight").lower(),
-        gender=g("gender", "all").lower(),
+        content_category=g("content_category", "straight"),
+        gender=g("gender", "all"),
         labels=_list(g("labels")),
         exchange_id=g("exchange_id"),
         geo_name=g("geo_name"),
@@ -142,7 +247,7 @@ def _row_to_config(row: dict, row_num: int) -> V4CampaignConfig:
         per_source_test_budget=_float(g("per_source_test_budget"), 5.00),
         max_bid=_float(g("max_bid"), 0.30),
         cpm_adjust=_optional_float(g("cpm_adjust")),
-        cpm_bid_mode=g("cpm_bid_mode", "").lower(),
+        cpm_bid_mode=g("cpm_bid_mode", ""),
         cpm_bid_value=_optional_float(g("cpm_bid_value")),
         include_all_sources=_bool(g("include_all_sources", "TRUE")),
         automation_rules=g("automation_rules"),
@@ -153,39 +258,64 @@ def _row_to_config(row: dict, row_num: int) -> V4CampaignConfig:
         schedule_dayparting=g("schedule_dayparting"),
         frequency_cap=_int(g("frequency_cap"), 3),
         frequency_cap_every=_int(g("frequency_cap_every"), 24),
-        budget_type=g("budget_type", "custom").lower(),
+        budget_type=g("budget_type", "custom"),
         daily_budget=_float(g("daily_budget"), 25.00),
     )
 
 
 # ─── Public API ───────────────────────────────────────────────────
 
-def parse_v4_csv(csv_path: str | Path) -> List[V4CampaignConfig]:
+def iter_v4_csv(csv_path: str | Path) -> Iterator[V4CampaignConfig]:
+    """
+    Lazily parse a V4 campaign CSV, yielding one V4CampaignConfig per row.
+
+    Lets callers start creating campaigns before the whole file is parsed.
+    Raises V4CSVParseError for a missing file immediately, and for bad rows
+    (or a file with no data rows) when iteration reaches them.
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        raise V4CSVParseError(f"CSV file not found: {csv_path}")
+    return _iter_configs(csv_path)
+
+
+def _iter_configs(csv_path: Path) -> Iterator[V4CampaignConfig]:
+    row_num = 1
+    for row_num, row in enumerate(_iter_rows(csv_path), start=2):  # row 1 is header
+        try:
+            yield _row_to_config(row, row_num)
+        except V4CSVParseError:
+            raise
+        except Exception as e:
+            raise V4CSVParseError(f"Row {row_num}: failed to parse — {e}") from e
+
+    if row_num == 1:
+        raise V4CSVParseError("CSV file contains no data rows")
+
+
+def parse_v4_csv(csv_path: str | Path, use_cache: bool = True) -> List[V4CampaignConfig]:
     """
     Parse a V4 campaign CSV and return a list of V4CampaignConfig objects.
 
     Supports all ~63 columns defined in TEMPLATE_ALL_FIELDS.csv.
     Every column except 'group', 'csv_file' is optional with sensible defaults.
+    With *use_cache*, the parsed list is cached as JSON under the tool's cache
+    directory and reused while the CSV's mtime and size (and the parser
+    version) are unchanged.
     """
     csv_path = Path(csv_path)
     if not csv_path.exists():
         raise V4CSVParseError(f"CSV file not found: {csv_path}")
 
-    configs: List[V4CampaignConfig] = []
+    if use_cache:
+        cached = _load_cached(csv_path)
+        if cached:
+            logger.info(f"Loaded {len(cached)} campaign configs from cache for {csv_path.name}")
+            return cached
 
-    with open(csv_path, "r", newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        for row_num, row in enumerate(reader, start=2):  # row 1 is header
-            try:
-                config = _row_to_config(row, row_num)
-                configs.append(config)
-            except V4CSVParseError:
-                raise
-            except Exception as e:
-                raise V4CSVParseError(f"Row {row_num}: failed to parse — {e}") from e
-
-    if not configs:
-        raise V4CSVParseError("CSV file contains no data rows")
+    configs = list(iter_v4_csv(csv_path))
 
     logger.info(f"Parsed {len(configs)} campaign configs from {csv_path.name}")
+    if use_cache:
+        _store_cached(csv_path, configs)
     return configs
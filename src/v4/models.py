@@ -4,9 +4,12 @@ from dataclasses import dataclass, field
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class V4CampaignConfig:
-    """Complete campaign configuration covering all ~63 CSV columns."""
+    """Complete campaign configuration covering all ~63 CSV columns.
+
+    Slotted: one instance per CSV row, so no per-instance ``__dict__``.
+    """
 
     # ── Core ──────────────────────────────────────────────────────
     template_campaign_id: str = ""     # TJ campaign ID to clone from (inherits bids/sources)
@@ -99,6 +102,21 @@ class V4CampaignConfig:
     budget_type: str = "custom"        # "custom" or "unlimited"
     daily_budget: float = 25.00
 
+    def __post_init__(self):
+        # Canonical case for enum-like fields, so hot paths compare without .lower()/.upper()
+        self.language = self.language.upper()
+        self.bid_type = self.bid_type.upper()
+        self.campaign_type = self.campaign_type.title()
+        self.content_rating = self.content_rating.upper()
+        self.match_type = self.match_type.lower()
+        self.ad_format_type = self.ad_format_type.lower()
+        self.format_type = self.format_type.lower()
+        self.ad_type = self.ad_type.lower()
+        self.content_category = self.content_category.lower()
+        self.gender = self.gender.lower()
+        self.cpm_bid_mode = self.cpm_bid_mode.lower()
+        self.budget_type = self.budget_type.lower()
+
     # ── Derived helpers ───────────────────────────────────────────
     @property
     def primary_keyword(self) -> str:
@@ -108,11 +126,39 @@ class V4CampaignConfig:
 
     @property
     def is_cpm(self) -> bool:
-        return self.bid_type.upper() == "CPM"
+        return self.bid_type == "CPM"
 
     @property
     def is_remarketing(self) -> bool:
-        return self.campaign_type.lower() == "remarketing"
+        return self.campaign_type == "Remarketing"
+
+    @property
+    def needs_group_change(self) -> bool:
+        """False when the draft's pre-selected "General" group is already correct."""
+        return bool(self.group) and self.group.lower() != "general"
+
+    @property
+    def needs_labels_change(self) -> bool:
+        return bool(self.labels)
+
+    @property
+    def tracker_ids(self) -> List[str]:
+        """Tracker names from tracker_id — ";"-separated if any ";" is present, else ","."""
+        sep = ";" if ";" in self.tracker_id else ","
+        return [t.strip() for t in self.tracker_id.split(sep) if t.strip()]
+
+    @property
+    def source_terms(self) -> List[str]:
+        """Source name terms from source_selection; empty for "" or "ALL"."""
+        ss = (self.source_selection or "").strip()
+        if not ss or ss.upper() == "ALL":
+            return []
+        return [t.strip() for t in ss.split(";") if t.strip()]
+
+    @property
+    def include_all_sources_effective(self) -> bool:
+        """True when Step 3 should include every source (no source terms given)."""
+        return not self.source_terms
 
     @property
     def has_os_targeting(self) -> bool:
@@ -1,13 +1,13 @@
 """Step 1 — Basic Settings: name, rating, group, labels, device, format, dimensions, etc."""
 
-import time
+import functools
 import logging
 from playwright.sync_api import Page
 
 from ..models import V4CampaignConfig
 from ..utils import (
-    safe_click, wait_and_fill, set_radio, dismiss_modals,
-    click_save_and_continue, extract_campaign_id,
+    safe_click, wait_and_fill, set_radios, dismiss_modals,
+    click_save_and_continue, extract_campaign_id, wait_stable, wait_for_select2_ready,
 )
 
 logger = logging.getLogger(__name__)
@@ -26,6 +26,35 @@ DIMENSION_MAP = {
 GENDER_MAP = {"all": "1", "male": "2", "female": "3"}
 
 
+@functools.lru_cache(maxsize=256)
+def resolve_step1_radios(
+    device: str, ad_format_type: str, format_type: str, ad_type: str,
+    ad_dimensions: str, content_category: str, gender: str,
+) -> tuple:
+    """Map Step 1 config values to ((radio name, value), ...) in the order they must be set.
+
+    Cached: batch runs repeat the same handful of campaign shapes.
+    """
+    cat = content_category
+    if cat not in ("straight", "gay", "trans"):
+        cat = "straight"
+
+    radios = [
+        ("platform_id", DEVICE_MAP.get(device, "2")),
+        ("ad_format_id", AD_FORMAT_MAP.get(ad_format_type, "1")),
+    ]
+    # Format Type (only for display)
+    if ad_format_type == "display":
+        radios.append(("format_type_id", FORMAT_TYPE_MAP.get(format_type, "5")))
+    radios += [
+        ("ad_type_id", AD_TYPE_MAP.get(ad_type, "9")),
+        ("ad_dimension_id", DIMENSION_MAP.get(ad_dimensions.lower().replace(" ", ""), "9")),
+        ("content_category_id", cat),
+        ("demographic_targeting_id", GENDER_MAP.get(gender, "1")),
+    ]
+    return tuple(radios)
+
+
 def configure_step1(page: Page, config: V4CampaignConfig, campaign_name: str, variant: str) -> str:
     """Fill Basic Settings page and click Save & Continue. Returns campaign_id."""
     logger.info(f"  [Step 1] Configuring basic settings...")
@@ -43,19 +72,23 @@ def configure_step1(page: Page, config: V4CampaignConfig, campaign_name: str, va
             page.click(f'label:has-text("{config.content_rating}")', timeout=2000)
         except Exception:
             logger.debug("Could not set content rating — may already be selected")
-    time.sleep(0.3)
+    wait_stable(page, f'input[value="{rating}"]:checked', timeout=1500, state="attached")
 
     # 3. Group
-    _select_or_create_group(page, config.group)
+    if config.needs_group_change:
+        _select_or_create_group(page, config.group)
+    else:
+        logger.info("    Group: General (pre-selected)")
 
     # 4. Labels
-    if config.labels:
+    if config.needs_labels_change:
         _set_labels(page, config.labels)
 
-    # 5. Exchange ID (select2 — hidden native select)
+    # 5. Exchange ID (select2 — hidden native select). Cloned or edited drafts
+    # may not be on TJX, so always compare the current selection's title (one
+    # cheap attribute read) rather than trusting the config value.
     if config.exchange_id:
         try:
-            # Check if already set to correct value
             container = page.locator('span[id="select2-exchange_id-container"]')
             current = container.get_attribute("title") or ""
             # Map exchange_id values to known display names
@@ -65,56 +98,30 @@ def configure_step1(page: Page, config: V4CampaignConfig, campaign_name: str, va
                 logger.info(f"    Exchange ID: {config.exchange_id} (already set)")
             else:
                 container.click(timeout=5000)
-                time.sleep(0.5)
+                wait_stable(page, 'li.select2-results__option')
                 option = page.locator('li.select2-results__option').filter(has_text=expected).first
                 option.click(timeout=5000)
-                time.sleep(0.3)
+                wait_stable(page, '.select2-container--open', state="hidden")
                 logger.info(f"    Exchange ID: {config.exchange_id}")
         except Exception as e:
             logger.warning(f"    Could not set exchange_id: {e}")
 
-    # 6. Device
+    # 6–12. Radio groups — resolved here, then set in a single JS round-trip
     device = config.device_for_variant(variant)
-    device_val = DEVICE_MAP.get(device, "2")
-    set_radio(page, "platform_id", device_val)
-    logger.info(f"    Device: {device}")
+    radios = resolve_step1_radios(
+        device, config.ad_format_type, config.format_type, config.ad_type,
+        config.ad_dimensions, config.content_category, config.gender,
+    )
+    set_radios(page, radios)
+    cat = dict(radios)["content_category_id"]
 
-    # 7. Ad Format Type
-    ad_fmt_val = AD_FORMAT_MAP.get(config.ad_format_type, "1")
-    set_radio(page, "ad_format_id", ad_fmt_val)
-    time.sleep(0.5)
+    logger.info(f"    Device: {device}")
     logger.info(f"    Ad format: {config.ad_format_type}")
-
-    # 8. Format Type (only for display)
     if config.ad_format_type == "display":
-        fmt_val = FORMAT_TYPE_MAP.get(config.format_type, "5")
-        set_radio(page, "format_type_id", fmt_val)
-        time.sleep(0.3)
         logger.info(f"    Format type: {config.format_type}")
-
-    # 9. Ad Type
-    at_val = AD_TYPE_MAP.get(config.ad_type, "9")
-    set_radio(page, "ad_type_id", at_val)
-    time.sleep(0.3)
     logger.info(f"    Ad type: {config.ad_type}")
-
-    # 10. Ad Dimensions
-    dim_norm = config.ad_dimensions.lower().replace(" ", "")
-    dim_val = DIMENSION_MAP.get(dim_norm, "9")
-    set_radio(page, "ad_dimension_id", dim_val)
-    time.sleep(0.3)
     logger.info(f"    Dimensions: {config.ad_dimensions}")
-
-    # 11. Content Category
-    cat = config.content_category.lower()
-    if cat not in ("straight", "gay", "trans"):
-        cat = "straight"
-    set_radio(page, "content_category_id", cat)
     logger.info(f"    Content category: {cat}")
-
-    # 12. Gender
-    gen_val = GENDER_MAP.get(config.gender, "1")
-    set_radio(page, "demographic_targeting_id", gen_val)
     logger.info(f"    Gender: {config.gender}")
 
     # 13. Multi-Ad Placements — always disable (we manage ads via CSV upload)
@@ -140,11 +147,11 @@ def _select_or_create_group(page: Page, group_name: str):
 
     try:
         page.click('span.select2-selection[aria-labelledby="select2-group_id-container"]')
-        time.sleep(0.5)
+        wait_stable(page, '.select2-container--open input.select2-search__field')
 
         search = page.locator('.select2-container--open input.select2-search__field')
         search.fill(group_name)
-        time.sleep(1)
+        wait_for_select2_ready(page, "select2-group_id-results")
 
         no_results = page.query_selector('li.select2-results__message')
         if no_results:
@@ -160,10 +167,9 @@ def _select_or_create_group(page: Page, group_name: str):
                     timeout=3000,
                 )
             except Exception:
-                time.sleep(0.5)
                 page.evaluate('document.querySelector("button#confirmNewGroupButton").disabled = false')
             page.click('button#confirmNewGroupButton')
-            time.sleep(0.5)
+            wait_stable(page, 'button#confirmNewGroupButton', state="hidden")
             logger.info(f"    Created new group: {group_name}")
         else:
             option = page.locator('li.select2-results__option').filter(has_text=group_name).first
@@ -171,7 +177,7 @@ def _select_or_create_group(page: Page, group_name: str):
                 option.click()
             else:
                 page.keyboard.press("Enter")
-            time.sleep(0.5)
+            wait_stable(page, '.select2-container--open', state="hidden")
             logger.info(f"    Selected group: {group_name}")
     except Exception as e:
         logger.warning(f"    Could not set group: {e}")
@@ -216,6 +222,7 @@ def _disable_multi_ad_placements(page: Page):
         return "unchecked_direct";
     }''')
     if "unchecked" in toggled:
+        wait_stable(page, '#allow_multi_placement:not(:checked)', timeout=1000, state="attached")
         logger.info(f"    Multi-Ad Placements: OFF ({toggled})")
     elif toggled == "already_off":
         logger.info("    Multi-Ad Placements: already OFF")
@@ -223,25 +230,28 @@ def _disable_multi_ad_placements(page: Page):
         logger.warning("    Multi-Ad Placements: toggle click did not uncheck — may need manual fix")
     elif toggled == "not_found":
         logger.debug("    Multi-Ad Placements toggle not found (may not exist on this page)")
-    time.sleep(0.3)
 
 
 def _set_labels(page: Page, labels: list):
     """Set campaign labels via select2 (#selectLabel)."""
     try:
-        # Remove existing labels
-        removed = 0
-        for _ in range(20):
-            btn = page.locator(".deleteLabel").first
-            if btn.count() > 0 and btn.is_visible():
-                try:
-                    btn.click(timeout=1000)
-                    time.sleep(0.2)
-                    removed += 1
-                except Exception:
-                    break
-            else:
-                break
+        # Remove existing labels in one JS pass (delete buttons, else the select2 backing <select>)
+        removed = page.evaluate('''() => {
+            const buttons = Array.from(document.querySelectorAll(".deleteLabel"))
+                .filter(b => b.offsetParent !== null);
+            if (buttons.length) {
+                buttons.forEach(b => b.click());
+                return buttons.length;
+            }
+            const sel = document.querySelector("#selectLabel");
+            if (!sel) return 0;
+            const selected = Array.from(sel.options).filter(o => o.selected);
+            if (!selected.length) return 0;
+            selected.forEach(o => { o.selected = false; });
+            if (typeof jQuery !== "undefined") jQuery(sel).trigger("change");
+            else sel.dispatchEvent(new Event("change", {bubbles: true}));
+            return selected.length;
+        }''')
         if removed:
             logger.info(f"    Removed {removed} existing label(s)")
 
@@ -261,21 +271,21 @@ def _set_labels(page: Page, labels: list):
             logger.warning("    Label input not found")
             return
         labels_input.click()
-        time.sleep(0.5)
+        wait_stable(page, '.select2-container--open .select2-results')
 
+        # Locator is lazy — build it once and re-resolve it for each label
+        opt = page.locator('li.select2-results__option:not(.loading-results)').first
         for label in labels:
             labels_input.fill(label)
-            time.sleep(0.5)
             try:
-                opt = page.locator('li.select2-results__option').first
                 opt.wait_for(state='visible', timeout=2000)
                 opt.click()
             except Exception:
                 page.keyboard.press("Enter")
-            time.sleep(0.3)
+            wait_stable(page, '.select2-container--open .select2-results', timeout=1000, state="hidden")
 
         page.keyboard.press("Escape")
-        time.sleep(0.3)
+        wait_stable(page, '.select2-container--open', timeout=1000, state="hidden")
         logger.info(f"    Labels: {labels}")
     except Exception as e:
         logger.warning(f"    Could not set labels: {e}")
@@ -1,15 +1,19 @@
 """Step 2 — Geo & Audience: geo selection + all toggle-gated targeting sections."""
 
-import time
 import logging
-from playwright.sync_api import Page
+from types import MappingProxyType
+from playwright.sync_api import Error as PlaywrightError, Page, TimeoutError as PlaywrightTimeout
 
 from ..models import V4CampaignConfig
-from ..utils import enable_toggle, select2_choose, safe_click
+from ..utils import (
+    enable_toggle, enable_toggles, select2_choose, safe_click, wait_stable,
+    wait_for_select2_ready,
+)
 
 logger = logging.getLogger(__name__)
 
-COUNTRY_MAP = {
+# Read-only: shared by every campaign (and thread) in a batch
+COUNTRY_MAP = MappingProxyType({
     # Gold
     "US": "United States", "CA": "Canada", "GB": "United Kingdom",
     "UK": "United Kingdom", "AU": "Australia", "NZ": "New Zealand",
@@ -44,28 +48,64 @@ COUNTRY_MAP = {
     "DO": "Dominican Republic", "EC": "Ecuador", "PY": "Paraguay",
     "BO": "Bolivia", "GT": "Guatemala", "HN": "Honduras", "SV": "El Salvador",
     "NI": "Nicaragua", "CU": "Cuba", "HT": "Haiti",
-}
+})
 
-LANGUAGE_MAP = {
+LANGUAGE_MAP = MappingProxyType({
     "EN": "English", "FR": "French", "DE": "German", "ES": "Spanish",
     "IT": "Italian", "PT": "Portuguese", "NL": "Dutch", "JA": "Japanese",
     "KO": "Korean", "ZH": "Chinese", "PL": "Polish", "RU": "Russian",
     "TR": "Turkish", "AR": "Arabic", "CS": "Czech", "SV": "Swedish",
     "DA": "Danish", "NO": "Norwegian", "FI": "Finnish", "HU": "Hungarian",
     "RO": "Romanian", "TH": "Thai",
-}
+})
+
+# Variants that never get OS targeting, and the OS list auto-derived for the rest
+NO_OS_VARIANTS = frozenset({"desktop", "all"})
+OS_FOR_VARIANT = MappingProxyType({
+    "ios": ("iOS",),
+    "android": ("Android",),
+    "all_mobile": ("iOS", "Android"),
+    "mobile": ("iOS", "Android"),
+})
+
+OP_LABEL_MAP = MappingProxyType({
+    "newer_than": "Newer than",
+    "older_than": "Older than",
+    "equal": "Equal to",
+})
+
+
+def _country(code: str) -> str:
+    """Country display name for an ISO code (codes are usually upper-case already)."""
+    return COUNTRY_MAP.get(code) or COUNTRY_MAP.get(code.upper(), code)
+
+
+def _language(code: str) -> str:
+    """Browser-language display name for a language code."""
+    return LANGUAGE_MAP.get(code) or LANGUAGE_MAP.get(code.upper(), code)
+
+
+GEO_CONTAINER = 'span[id="select2-geo_country-container"]'
+OS_SELECT_INCLUDE = 'span[id="select2-operating_systems_list_include-container"]'
+OS_SELECT_EXCLUDE = 'span[id="select2-operating_systems_list_exclude-container"]'
+ADD_OS_INCLUDE_BTN = 'button.smallButton.greenButton.addOsTarget[data-selection="include"]'
+ADD_OS_EXCLUDE_BTN = 'button.smallButton.redButton.addOsTarget[data-selection="exclude"]'
+SEGMENT_LINK_INCLUDED = 'a.openSegmentTargetingModal[data-targeting-segment-type="included"]'
+SEGMENT_SEARCH = 'input[placeholder*="VOD"], input[placeholder*="Try"]'
 
 
 def configure_step2(page: Page, config: V4CampaignConfig, variant: str):
     """Configure Geo & all toggle-gated targeting sections on Step 2."""
     logger.info("  [Step 2] Configuring geo & audience targeting...")
 
-    # Wait for page to fully load after step 1 navigation
+    # Wait for the DOM, then for the first widget we touch (networkidle never
+    # settles on pages with analytics polling)
     try:
-        page.wait_for_load_state("networkidle", timeout=15000)
-    except Exception:
+        page.wait_for_load_state("domcontentloaded", timeout=15000)
+    except PlaywrightTimeout:
         pass
-    time.sleep(2)
+    if not wait_stable(page, GEO_CONTAINER, timeout=15000):
+        logger.warning("    Geo selector not visible after 15s — continuing anyway")
 
     # Geo — only modify if CSV specified geos (non-default)
     if config.geo and config.geo != ["US"]:
@@ -75,44 +115,58 @@ def configure_step2(page: Page, config: V4CampaignConfig, variant: str):
 
     # OS targeting — skip for desktop/all variants, auto-derive for mobile variants
     v = variant.lower().strip()
-    if v in ("desktop", "all"):
+    if v in NO_OS_VARIANTS:
         logger.info(f"    OS targeting: skipped ({v} variant)")
     elif config.has_os_targeting:
         _configure_os_targeting(page, config)
-    else:
-        if v == "ios":
-            _auto_os_for_variant(page, ["iOS"], config)
-        elif v == "android":
-            _auto_os_for_variant(page, ["Android"], config)
-        elif v in ("all_mobile", "mobile"):
-            _auto_os_for_variant(page, ["iOS", "Android"], config)
+    elif v in OS_FOR_VARIANT:
+        _auto_os_for_variant(page, OS_FOR_VARIANT[v], config)
+
+    # Read each section flag once — the toggle pre-pass and the gates below share them
+    has_language = config.has_browser_language
+    has_postal = config.has_postal_codes
+    has_isp = config.has_isp_targeting
+    has_ip = config.has_ip_targeting
+    has_income = config.has_income_targeting
+    has_retargeting = config.has_retargeting
+
+    # Switch on every plain-checkbox toggle needed below in one pass, so their
+    # sections render together instead of one settle pause per section
+    enable_toggles(page, [section_id for wanted, section_id in (
+        (has_language, "campaign_browserLanguageTargeting"),
+        (has_postal, "campaign_postalCodeTargeting"),
+        (has_isp, "campaign_ispTargeting"),
+        (has_ip, "campaign_ipTargeting"),
+        (has_income, "campaign_publicSegmentTargeting"),
+        (has_retargeting, "campaign_retargeting"),
+    ) if wanted])
 
     # Browser targeting
     if config.has_browser_targeting:
         _configure_browser_targeting(page, config)
 
     # Browser language
-    if config.has_browser_language:
+    if has_language:
         _configure_browser_language(page, config)
 
     # Postal codes
-    if config.has_postal_codes:
+    if has_postal:
         _configure_postal_codes(page, config)
 
     # ISP targeting
-    if config.has_isp_targeting:
+    if has_isp:
         _configure_isp(page, config)
 
     # IP range targeting
-    if config.has_ip_targeting:
+    if has_ip:
         _configure_ip_range(page, config)
 
     # Income / public segment
-    if config.has_income_targeting:
+    if has_income:
         _configure_income(page, config)
 
     # Retargeting
-    if config.has_retargeting:
+    if has_retargeting:
         _configure_retargeting(page, config)
 
     # VR targeting
@@ -129,56 +183,135 @@ def configure_step2(page: Page, config: V4CampaignConfig, variant: str):
         _configure_segments_exclude(page, segment_exclude)
 
 
-# ─── Geo ──────────────────────────────────────────────────────────
+# ─── Wait helpers ─────────────────────────────────────────────────
 
-def _add_geos(page: Page, geo_list: list):
-    """Add all geos via select2 dropdown."""
-    # Wait for the geo section to be ready
+def _wait_select2_open(page: Page, timeout: int = 3000) -> bool:
+    """Wait for an open select2 dropdown to render its (non-loading) options."""
+    return wait_stable(
+        page, '.select2-container--open .select2-results__option:not(.loading-results)',
+        timeout=timeout,
+    )
+
+
+def _wait_select2_closed(page: Page, timeout: int = 3000) -> bool:
+    """Wait until no select2 dropdown is open."""
+    return wait_stable(page, '.select2-container--open', timeout=timeout, state="detached")
+
+
+def _close_select2(page: Page):
+    """Close any open select2 dropdown through its jQuery API (Escape as fallback)."""
+    closed = page.evaluate('''() => {
+        if (typeof jQuery !== "undefined") {
+            jQuery("select.select2-hidden-accessible").each(function () {
+                const inst = jQuery(this).data("select2");
+                if (inst && inst.isOpen()) inst.close();
+            });
+        }
+        return !document.querySelector(".select2-container--open");
+    }''')
+    if not closed:
+        page.keyboard.press("Escape")
+        _wait_select2_closed(page, timeout=1000)
+
+
+def _wait_modal_text(page: Page, text: str = "", timeout: int = 15000) -> bool:
+    """Wait until no visible modal says "Loading" and, if given, one of them shows *text*."""
     try:
-        page.wait_for_selector(
-            'span[id="select2-geo_country-container"]',
-            state="visible", timeout=15000,
+        page.wait_for_function(
+            '''(text) => {
+                let found = !text;
+                for (const m of document.querySelectorAll('[class*="modal"]')) {
+                    if (m.offsetHeight === 0) continue;
+                    if (m.innerText.includes("Loading")) return false;
+                    if (text && m.innerText.includes(text)) found = true;
+                }
+                return found;
+            }''',
+            arg=text,
+            timeout=timeout,
         )
-    except Exception:
-        logger.warning("    Geo selector not found, waiting longer...")
-        time.sleep(3)
+        return True
+    except PlaywrightTimeout:
+        return False
+
+
+# ─── Batched select2 adds ─────────────────────────────────────────
+
+# Optionally click every existing entry's remove link, then select each name on
+# the native <select> behind a select2 and click its Add button — all in one
+# round-trip, so the page recomputes targeting once. Returns the names that
+# could not be added this way (option not loaded yet, Add button stayed disabled, …).
+_ADD_VIA_SELECT_JS = '''([selectSel, buttonSel, names, clearSel]) => {
+    if (clearSel) document.querySelectorAll(clearSel).forEach(a => a.click());
+    const sel = document.querySelector(selectSel);
+    const btn = document.querySelector(buttonSel);
+    if (!sel || !btn) return names;
+    const missing = [];
+    for (const name of names) {
+        const opt = Array.from(sel.options).find(o => o.textContent.trim() === name);
+        if (!opt) { missing.push(name); continue; }
+        sel.value = opt.value;
+        if (typeof jQuery !== "undefined") jQuery(sel).trigger("change");
+        else sel.dispatchEvent(new Event("change", {bubbles: true}));
+        if (btn.disabled) { missing.push(name); continue; }
+        btn.click();
+    }
+    return missing;
+}'''
+
+
+def _add_via_select(
+    page: Page, select_sel: str, button_sel: str, names: list, clear_sel: str = "",
+) -> list:
+    """Add *names* through the hidden <select> in one JS call; return those needing the UI path.
 
-    # Remove existing geo if present
+    With *clear_sel*, existing entries are removed (by clicking those links) in the same call.
+    """
+    if not names:
+        return []
     try:
-        remove_links = page.locator('a.removeTargetedLocation')
-        for i in range(remove_links.count()):
-            link = remove_links.nth(0)  # always click first — they shift
-            if link.is_visible(timeout=1000):
-                link.click()
-                time.sleep(0.5)
-    except Exception:
-        pass
+        return page.evaluate(_ADD_VIA_SELECT_JS, [select_sel, button_sel, list(names), clear_sel])
+    except PlaywrightError as e:
+        logger.debug(f"Batched add via {select_sel} failed: {e}")
+        return list(names)
 
-    added = 0
-    for geo in geo_list:
-        country_name = COUNTRY_MAP.get(geo.upper(), geo)
+
+# ─── Geo ──────────────────────────────────────────────────────────
+
+def _add_geos(page: Page, geo_list: list):
+    """Add all geos via select2 dropdown (configure_step2 has already waited for it)."""
+    # Remove existing geos and add the new ones in one pass
+    country_names = [_country(geo) for geo in geo_list]
+    pending = set(_add_via_select(
+        page, '#geo_country', 'button#addLocation', country_names,
+        clear_sel='a.removeTargetedLocation',
+    ))
+
+    # Anything the batch could not add goes through the select2 search UI
+    added = len(country_names) - sum(name in pending for name in country_names)
+    geo_container = page.locator(GEO_CONTAINER)
+    search = page.locator('input.select2-search__field[placeholder="Type here to search"]')
+    add_btn = page.locator('button#addLocation:not([disabled])')
+    for geo, country_name in zip(geo_list, country_names):
+        if country_name not in pending:
+            continue
         try:
-            page.click('span[id="select2-geo_country-container"]')
-            time.sleep(0.5)
-            search = page.locator('input.select2-search__field[placeholder="Type here to search"]')
+            geo_container.click()
+            _wait_select2_open(page)
             search.fill(country_name)
-            time.sleep(1)
-            # Wait for results to settle and click the matching option
+            wait_for_select2_ready(page, "select2-geo_country-results", text=country_name)
+            # Click the matching option
             option = page.locator('li.select2-results__option').filter(has_text=country_name).first
             option.click(timeout=5000)
-            time.sleep(0.3)
-            # Wait for Add button to be enabled, then click
-            page.wait_for_selector('button#addLocation:not([disabled])', timeout=5000)
-            page.click('button#addLocation')
-            time.sleep(0.5)
+            # Click auto-waits for the Add button to be enabled
+            add_btn.click(timeout=5000)
             added += 1
-        except Exception as e:
+        except PlaywrightError as e:
             logger.warning(f"    Could not add geo '{geo}' ({country_name}): {e}")
             # Close any open dropdown before continuing
             try:
-                page.keyboard.press("Escape")
-                time.sleep(0.3)
-            except Exception:
+                _close_select2(page)
+            except PlaywrightError:
                 pass
 
     logger.info(f"    Geo: {added}/{len(geo_list)} added")
@@ -197,7 +330,6 @@ def _enable_os_section(page: Page):
         if (!section) return;
         section.scrollIntoView({block: "center"});
     }''')
-    time.sleep(0.5)
 
     # Check if already enabled
     is_on = page.evaluate('''() => {
@@ -215,19 +347,14 @@ def _enable_os_section(page: Page):
     if not is_on:
         # Click the onoffswitch label to enable
         page.click('.onoffswitch-label[data-input="#operating_systems"]')
-        time.sleep(1.5)
     else:
         logger.info("    OS targeting: already enabled")
-        time.sleep(0.5)
 
-    # Verify the select2 is now visible
+    # Wait for the select2 to become visible
     try:
-        page.wait_for_selector(
-            'span[id="select2-operating_systems_list_include-container"]',
-            state="visible", timeout=5000,
-        )
+        page.wait_for_selector(OS_SELECT_INCLUDE, state="visible", timeout=5000)
         logger.info("    OS targeting: section enabled")
-    except Exception:
+    except PlaywrightError:
         # Force-show via JS as last resort
         page.evaluate('''() => {
             const section = document.querySelector("#campaign_operatingSystemsTargeting");
@@ -239,36 +366,28 @@ def _enable_os_section(page: Page):
                 if (content) content.style.display = '';
             }
         }''')
-        time.sleep(1)
         logger.warning("    OS targeting: force-showed via JS")
 
+
+def _clear_os_targets(page: Page):
+    """Remove every existing OS include/exclude entry in one JS pass."""
+    try:
+        page.evaluate('''() => {
+            document.querySelectorAll('a.removeAll[data-selection="include"]').forEach(a => a.click());
+            document.querySelectorAll('a.removeOsTarget').forEach(a => a.click());
+        }''')
+    except PlaywrightError as e:
+        logger.debug(f"Could not clear OS targets: {e}")
+
+
 def _auto_os_for_variant(page: Page, os_names: list, config: V4CampaignConfig):
     """Auto-derive OS targeting from variant (no explicit CSV column set)."""
     _enable_os_section(page)
-    time.sleep(1)
 
-    # Remove existing OS entries (safely)
-    try:
-        remove_all = page.locator('a.removeAll[data-selection="include"]')
-        if remove_all.count() > 0 and remove_all.first.is_visible(timeout=2000):
-            remove_all.first.click()
-            time.sleep(0.5)
-    except Exception:
-        pass
+    # Remove existing OS entries
+    _clear_os_targets(page)
 
-    try:
-        for _ in range(10):
-            btn = page.locator('a.removeOsTarget')
-            if btn.count() > 0 and btn.first.is_visible(timeout=1000):
-                btn.first.click()
-                time.sleep(0.3)
-            else:
-                break
-    except Exception:
-        pass
-
-    for os_name in os_names:
-        _add_single_os(page, os_name, config)
+    _add_os_list(page, os_names, config)
 
     logger.info(f"    OS targeting (auto): {', '.join(os_names)}")
 
@@ -276,120 +395,101 @@ def _auto_os_for_variant(page: Page, os_names: list, config: V4CampaignConfig):
 def _configure_os_targeting(page: Page, config: V4CampaignConfig):
     """Configure OS targeting from explicit CSV columns."""
     _enable_os_section(page)
-    time.sleep(1)
 
-    # Remove existing (safely — check visibility before clicking)
-    try:
-        remove_all = page.locator('a.removeAll[data-selection="include"]')
-        if remove_all.count() > 0 and remove_all.first.is_visible(timeout=2000):
-            remove_all.first.click()
-            time.sleep(0.5)
-    except Exception:
-        pass
-
-    try:
-        for _ in range(10):
-            btn = page.locator('a.removeOsTarget')
-            if btn.count() > 0 and btn.first.is_visible(timeout=1000):
-                btn.first.click()
-                time.sleep(0.3)
-            else:
-                break
-    except Exception:
-        pass
+    # Remove existing
+    _clear_os_targets(page)
 
     # Include
     if config.os_include:
-        for os_name in config.os_include.split(";"):
-            os_name = os_name.strip()
-            if os_name:
-                _add_single_os(page, os_name, config)
+        os_names = [n.strip() for n in config.os_include.split(";") if n.strip()]
+        _add_os_list(page, os_names, config)
         logger.info(f"    OS include: {config.os_include}")
 
     # Exclude (uses separate selector)
     if config.os_exclude:
-        for os_name in config.os_exclude.split(";"):
-            os_name = os_name.strip()
-            if os_name:
-                _add_single_os_exclude(page, os_name)
+        os_names = [n.strip() for n in config.os_exclude.split(";") if n.strip()]
+        pending = _add_via_select(page, '#operating_systems_list_exclude', ADD_OS_EXCLUDE_BTN, os_names)
+        for os_name in pending:
+            _add_single_os_exclude(page, os_name)
         logger.info(f"    OS exclude: {config.os_exclude}")
 
 
+def _os_version(os_name: str, config: V4CampaignConfig) -> tuple:
+    """Return (version_op, version) configured for *os_name*, or empty strings."""
+    if os_name == "iOS":
+        return config.ios_version_op, config.ios_version
+    if os_name == "Android":
+        return config.android_version_op, config.android_version
+    return "", ""
+
+
+def _add_os_list(page: Page, os_names: list, config: V4CampaignConfig):
+    """Add OS include entries — plain ones in one JS batch, version-constrained ones via the UI."""
+    plain = [n for n in os_names if not all(_os_version(n, config))]
+    pending = set(_add_via_select(page, '#operating_systems_list_include', ADD_OS_INCLUDE_BTN, plain))
+    for os_name in os_names:
+        if os_name in pending or os_name not in plain:
+            _add_single_os(page, os_name, config)
+
+
 def _add_single_os(page: Page, os_name: str, config: V4CampaignConfig):
     """Add a single OS to the include list with optional version constraint."""
-    os_select = page.locator('span[id="select2-operating_systems_list_include-container"]')
+    os_select = page.locator(OS_SELECT_INCLUDE)
     try:
         os_select.wait_for(state="visible", timeout=10000)
-        os_select.scroll_into_view_if_needed()
         os_select.click(timeout=5000)
-    except Exception:
+    except PlaywrightError:
         logger.warning("    OS select2 not visible after waiting")
         raise
-    time.sleep(0.5)
+    _wait_select2_open(page)
     page.click(f'li.select2-results__option:has-text("{os_name}")')
-    time.sleep(0.3)
+    _wait_select2_closed(page)
 
     # Version constraint
-    version_op = ""
-    version_val = ""
-    if os_name == "iOS":
-        version_op = config.ios_version_op
-        version_val = config.ios_version
-    elif os_name == "Android":
-        version_op = config.android_version_op
-        version_val = config.android_version
-
+    version_op, version_val = _os_version(os_name, config)
     if version_op and version_val:
         _set_version_constraint(page, version_op, version_val)
 
-    page.click('button.smallButton.greenButton.addOsTarget[data-selection="include"]')
-    time.sleep(0.5)
+    page.click(ADD_OS_INCLUDE_BTN)
     page.click('body')
-    time.sleep(0.3)
 
 
 def _add_single_os_exclude(page: Page, os_name: str):
     """Add a single OS to the exclude list."""
     try:
-        page.click('span[id="select2-operating_systems_list_exclude-container"]')
-        time.sleep(0.5)
+        page.click(OS_SELECT_EXCLUDE)
+        _wait_select2_open(page)
         page.click(f'li.select2-results__option:has-text("{os_name}")')
-        time.sleep(0.3)
-        page.click('button.smallButton.redButton.addOsTarget[data-selection="exclude"]')
-        time.sleep(0.5)
-    except Exception as e:
+        _wait_select2_closed(page)
+        page.click(ADD_OS_EXCLUDE_BTN)
+    except PlaywrightError as e:
         logger.warning(f"    Could not exclude OS {os_name}: {e}")
 
 
 def _set_version_constraint(page: Page, op: str, version: str):
     """Set the version operator and version number."""
-    op_label_map = {
-        "newer_than": "Newer than",
-        "older_than": "Older than",
-        "equal": "Equal to",
-    }
-    label = op_label_map.get(op.lower())
+    label = OP_LABEL_MAP.get(op.lower())
     if not label:
         return
 
     try:
         page.click('span[id="select2-operating_system_selectors_include-container"]')
-        time.sleep(0.5)
+        _wait_select2_open(page)
         page.click(f'li.select2-results__option:has-text("{label}")')
-        time.sleep(0.5)
+        _wait_select2_closed(page)
 
         page.click('span[id="select2-single_version_include-container"]')
-        time.sleep(0.5)
+        _wait_select2_open(page)
         search = page.locator(
             'input.select2-search__field[aria-controls="select2-single_version_include-results"]'
         )
-        search.type(version, delay=100)
-        time.sleep(0.5)
+        search.fill(version)  # select2 searches on the input event fill() fires
+        wait_for_select2_ready(page, "select2-single_version_include-results", text=version)
         page.wait_for_selector('li.select2-results__option--highlighted', timeout=5000)
         page.click('li.select2-results__option--highlighted')
-        time.sleep(0.3)
+        _wait_select2_closed(page)
         logger.info(f"    Version constraint: {label} {version}")
-    except Exception as e:
+    except PlaywrightError as e:
         logger.warning(f"    Could not set version constraint: {e}")
 
 
@@ -411,27 +511,24 @@ def _configure_browser_targeting(page: Page, config: V4CampaignConfig):
         # Try onoffswitch label first, then fallback to enable_toggle
         try:
             page.click('.onoffswitch-label[data-input="#browser_targeting"]', timeout=3000)
-        except Exception:
+        except PlaywrightError:
             enable_toggle(page, "campaign_browserTargeting")
-        time.sleep(1)
+        wait_stable(page, '#browser_targeting:checked', timeout=2000, state="attached")
     else:
         logger.info("    Browser targeting: already enabled")
 
-    # Uncheck all browsers first to start clean
-    page.evaluate('''() => {
+    # Uncheck all browsers to start clean, then check the specified ones —
+    # one JS pass (case-insensitive substring match)
+    results = page.evaluate('''(names) => {
         document.querySelectorAll("input[name='browsers_list[]']:checked").forEach(cb => {
             cb.checked = false;
             cb.dispatchEvent(new Event("change", {bubbles: true}));
         });
-    }''')
-    time.sleep(0.3)
-
-    # Check the specified browsers (use case-insensitive substring match)
-    for browser_name in config.browsers_include:
-        checked = page.evaluate('''(name) => {
+        const checkboxes = document.querySelectorAll("input[name='browsers_list[]']");
+        const labels = document.querySelectorAll("label");
+        return names.map((name) => {
             const nameLower = name.toLowerCase();
             // First try: browsers_list[] checkboxes with matching labels
-            const checkboxes = document.querySelectorAll("input[name='browsers_list[]']");
             for (const cb of checkboxes) {
                 const label = document.querySelector("label[for='" + cb.id + "']");
                 const labelText = label ? label.textContent.trim().toLowerCase() : "";
@@ -446,7 +543,6 @@ def _configure_browser_targeting(page: Page, config: V4CampaignConfig):
                 }
             }
             // Second try: any label containing the browser name
-            const labels = document.querySelectorAll("label");
             for (const label of labels) {
                 if (label.textContent.trim().toLowerCase().includes(nameLower)) {
                     const forId = label.getAttribute("for");
@@ -461,7 +557,9 @@ def _configure_browser_targeting(page: Page, config: V4CampaignConfig):
                 }
             }
             return "not_found";
-        }''', browser_name)
+        });
+    }''', list(config.browsers_include))
+    for browser_name, checked in zip(config.browsers_include, results):
         if "not_found" in checked:
             logger.warning(f"    Browser {browser_name}: not found")
         else:
@@ -474,53 +572,37 @@ def _configure_browser_targeting(page: Page, config: V4CampaignConfig):
 
 def _configure_browser_language(page: Page, config: V4CampaignConfig):
     """Enable browser language toggle and select the language."""
-    lang_name = LANGUAGE_MAP.get(config.browser_language.upper(), config.browser_language)
+    lang_name = _language(config.browser_language)
 
     enable_toggle(page, "campaign_browserLanguageTargeting")
-    time.sleep(0.5)
 
     section = page.locator("#campaign_browserLanguageTargeting")
-    section.scroll_into_view_if_needed()
 
-    # Remove existing languages
-    page.evaluate('''() => {
+    # Scroll the section in once, then remove existing languages — click until
+    # none are left, yielding a frame between passes so select2 can re-render
+    page.evaluate('''async () => {
         const section = document.querySelector("#campaign_browserLanguageTargeting");
         if (!section) return;
-        section.querySelectorAll(
-            "a.removeBtn, a.removeBrowserLanguage, a[class*='remove'], "
-            + "button[class*='remove'], .select2-selection__choice__remove"
-        ).forEach(btn => btn.click());
+        section.scrollIntoView({block: "center"});
+        const sel = "a.removeBtn, a.removeBrowserLanguage, a[class*='remove'], "
+            + "button[class*='remove'], .select2-selection__choice__remove";
+        for (let i = 0; i < 20; i++) {
+            const btns = section.querySelectorAll(sel);
+            if (!btns.length) return;
+            btns.forEach(btn => btn.click());
+            await new Promise(r => requestAnimationFrame(r));
+        }
     }''')
-    time.sleep(0.5)
-
-    # Also click visible remove buttons via Playwright
-    while True:
-        rm = section.locator("a[class*='remove'], .select2-selection__choice__remove").first
-        if rm.count() > 0 and rm.is_visible():
-            try:
-                rm.click(timeout=1000)
-                time.sleep(0.2)
-            except Exception:
-                break
-        else:
-            break
 
     # Select new language via select2
     s2 = section.locator(".select2-container").first
-    s2.scroll_into_view_if_needed()
-    time.sleep(0.3)
     s2.click()
-    time.sleep(0.5)
+    _wait_select2_open(page)
 
     search = page.locator(".select2-container--open .select2-search__field")
     search.fill(lang_name)
-    time.sleep(0.5)
     page.locator(".select2-results__option").filter(has_text=lang_name).first.click()
-    time.sleep(0.3)
-
-    if page.locator(".select2-container--open").count() > 0:
-        page.keyboard.press("Escape")
-        time.sleep(0.3)
+    _close_select2(page)
 
     logger.info(f"    Browser language: {lang_name}")
 
@@ -530,7 +612,6 @@ def _configure_browser_language(page: Page, config: V4CampaignConfig):
 def _configure_postal_codes(page: Page, config: V4CampaignConfig):
     """Enable postal code toggle and fill codes."""
     enable_toggle(page, "campaign_postalCodeTargeting")
-    time.sleep(0.5)
 
     # Set country (reuse first geo)
     if config.geo:
@@ -540,15 +621,24 @@ def _configure_postal_codes(page: Page, config: V4CampaignConfig):
                 'span[id="select2-postal_code_country-container"]',
                 config.geo[0],
             )
-        except Exception:
+        except PlaywrightError:
             pass
 
     # Fill postal codes textarea
     codes_text = ",".join(config.postal_codes)
     try:
-        page.fill('#postal_codes', codes_text)
-        time.sleep(0.3)
-    except Exception as e:
+        # Set the value directly — one call regardless of how many codes there are
+        found = page.evaluate('''(txt) => {
+            const ta = document.querySelector("#postal_codes");
+            if (!ta) return false;
+            ta.value = txt;
+            ta.dispatchEvent(new Event("input", {bubbles: true}));
+            ta.dispatchEvent(new Event("change", {bubbles: true}));
+            return true;
+        }''', codes_text)
+        if not found:
+            page.fill('#postal_codes', codes_text)
+    except PlaywrightError as e:
         logger.warning(f"    Could not fill postal codes: {e}")
 
     logger.info(f"    Postal codes: {codes_text}")
@@ -559,7 +649,6 @@ def _configure_postal_codes(page: Page, config: V4CampaignConfig):
 def _configure_isp(page: Page, config: V4CampaignConfig):
     """Enable ISP targeting toggle and select ISP."""
     enable_toggle(page, "campaign_ispTargeting")
-    time.sleep(0.5)
 
     # Country
     try:
@@ -568,9 +657,8 @@ def _configure_isp(page: Page, config: V4CampaignConfig):
             'span[id="select2-isp_country-container"]',
             config.isp_country,
         )
-    except Exception:
+    except PlaywrightError:
         pass
-    time.sleep(0.5)
 
     # ISP name
     try:
@@ -579,7 +667,7 @@ def _configure_isp(page: Page, config: V4CampaignConfig):
             '#isp_name + .select2-container, span[id*="isp_name"]',
             config.isp_name,
         )
-    except Exception as e:
+    except PlaywrightError as e:
         logger.warning(f"    Could not select ISP: {e}")
 
     logger.info(f"    ISP: {config.isp_country} / {config.isp_name}")
@@ -590,13 +678,11 @@ def _configure_isp(page: Page, config: V4CampaignConfig):
 def _configure_ip_range(page: Page, config: V4CampaignConfig):
     """Enable IP targeting toggle and fill start/end."""
     enable_toggle(page, "campaign_ipTargeting")
-    time.sleep(0.5)
 
     try:
         page.fill('#ip_range_start', config.ip_range_start)
         page.fill('#ip_range_end', config.ip_range_end)
-        time.sleep(0.3)
-    except Exception as e:
+    except PlaywrightError as e:
         logger.warning(f"    Could not set IP range: {e}")
 
     logger.info(f"    IP range: {config.ip_range_start} – {config.ip_range_end}")
@@ -607,15 +693,13 @@ def _configure_ip_range(page: Page, config: V4CampaignConfig):
 def _configure_income(page: Page, config: V4CampaignConfig):
     """Enable public segment toggle and select income segment."""
     enable_toggle(page, "campaign_publicSegmentTargeting")
-    time.sleep(0.5)
 
     # Select "Income" as segment type
     try:
         page.click('#public_segment_type_income', timeout=3000)
-        time.sleep(0.5)
-    except Exception:
+    except PlaywrightError:
         safe_click(page, 'label:has-text("Income")')
-        time.sleep(0.5)
+    wait_stable(page, '#public_segment_income + .select2-container')
 
     # Select specific income segment
     try:
@@ -624,7 +708,7 @@ def _configure_income(page: Page, config: V4CampaignConfig):
             '#public_segment_income + .select2-container, span[id*="public_segment_income"]',
             config.income_segment,
         )
-    except Exception as e:
+    except PlaywrightError as e:
         logger.warning(f"    Could not select income segment: {e}")
 
     logger.info(f"    Income segment: {config.income_segment}")
@@ -644,9 +728,7 @@ def _configure_retargeting(page: Page, config: V4CampaignConfig):
         const section = document.querySelector("#campaign_retargeting");
         if (section) section.scrollIntoView({block: "center"});
     }''')
-    time.sleep(0.5)
     enable_toggle(page, "campaign_retargeting")
-    time.sleep(1)
 
     # Type: click, impression, or cookie
     rt_type = (config.retargeting_type or "click").lower()
@@ -662,10 +744,9 @@ def _configure_retargeting(page: Page, config: V4CampaignConfig):
                 if (label) label.click();
             }}
         }}''')
-        time.sleep(1)
-    except Exception:
+    except PlaywrightError:
         safe_click(page, f'label:has(#retargeting_type_{rt_type})')
-        time.sleep(1)
+    wait_stable(page, f'#retargeting_type_{rt_type}:checked', timeout=2000, state="attached")
 
     if rt_type == "cookie":
         _configure_cookie_retargeting(page, config)
@@ -679,9 +760,8 @@ def _configure_audience_retargeting(page: Page, config: V4CampaignConfig):
     if config.retargeting_mode:
         try:
             page.click(f'#retargeting_mode_{config.retargeting_mode}', timeout=3000)
-        except Exception:
+        except PlaywrightError:
             safe_click(page, f'label:has-text("{config.retargeting_mode.title()}")')
-        time.sleep(0.3)
 
     if config.retargeting_value:
         try:
@@ -691,7 +771,7 @@ def _configure_audience_retargeting(page: Page, config: V4CampaignConfig):
                 config.retargeting_value,
                 timeout=90000,
             )
-        except Exception as e:
+        except PlaywrightError as e:
             logger.warning(f"    Could not select retargeting value: {e}")
 
     logger.info(
@@ -719,53 +799,47 @@ def _configure_cookie_retargeting(page: Page, config: V4CampaignConfig):
         return
 
     added = 0
+    cookie_container = page.locator('#select2-cookie-container')
+    search = page.locator('.select2-container--open .select2-search__field')
+    options = page.locator('li.select2-results__option')
+    add_btn = page.locator('button.addNewCookie')
     for cookie_name in cookie_names:
         try:
             # Click the cookie select2 container to open dropdown
-            page.click('#select2-cookie-container', timeout=5000)
-            time.sleep(1)
+            cookie_container.click(timeout=5000)
+            _wait_select2_open(page, timeout=5000)
 
             # Type the cookie name in the search field
-            search = page.locator('.select2-container--open .select2-search__field')
             search.fill(cookie_name)
-            time.sleep(2)  # Wait for results to load (can be slow)
+            # Results load via AJAX (can be slow)
+            wait_for_select2_ready(page, "select2-cookie-results", timeout=10000, text=cookie_name)
 
             # Click the matching option
-            option = page.locator('li.select2-results__option').filter(
-                has_text=cookie_name
-            ).first
+            option = options.filter(has_text=cookie_name).first
             try:
                 option.wait_for(state="visible", timeout=10000)
                 option.click()
-            except Exception:
+            except PlaywrightError:
                 # Try clicking first available option
-                page.locator('li.select2-results__option').first.click(timeout=5000)
-            time.sleep(1)
+                options.first.click(timeout=5000)
 
             # Click Add button (enabled after cookie selection)
-            add_btn = page.locator('button.addNewCookie')
             try:
                 add_btn.wait_for(state="visible", timeout=5000)
                 # Remove disabled if still set
-                page.evaluate('''() => {
-                    const btn = document.querySelector("button.addNewCookie");
-                    if (btn) btn.removeAttribute("disabled");
-                }''')
-                time.sleep(0.3)
+                add_btn.evaluate('(btn) => btn.removeAttribute("disabled")')
                 add_btn.click(force=True)
-                time.sleep(1)
                 added += 1
                 logger.info(f"    Cookie added: {cookie_name}")
-            except Exception as e:
+            except PlaywrightError as e:
                 logger.warning(f"    Could not click Add for cookie '{cookie_name}': {e}")
 
-        except Exception as e:
+        except PlaywrightError as e:
             logger.warning(f"    Could not select cookie '{cookie_name}': {e}")
             # Close any open dropdown
             try:
-                page.keyboard.press("Escape")
-                time.sleep(0.3)
-            except Exception:
+                _close_select2(page)
+            except PlaywrightError:
                 pass
 
     # Verify cookies were added by checking retargeting_list
@@ -801,15 +875,13 @@ def _configure_vr(page: Page, config: V4CampaignConfig):
     if not is_on:
         try:
             page.click('.onoffswitch-label[data-input="#virtual_reality"]', timeout=3000)
-        except Exception:
+        except PlaywrightError:
             enable_toggle(page, "campaign_virtualReality")
-        time.sleep(1)
 
     if config.vr_mode.lower() == "vr":
         safe_click(page, '#virtual_realityVR')
     else:
         safe_click(page, '#virtual_realitynonVR')
-    time.sleep(0.3)
 
     logger.info(f"    VR mode: {config.vr_mode}")
 
@@ -830,7 +902,6 @@ def _configure_segments(page: Page, config: V4CampaignConfig):
         const section = document.querySelector("#campaign_segmentTargeting");
         if (section) section.scrollIntoView({block: "center"});
     }''')
-    time.sleep(0.5)
 
     # Check if already enabled
     is_on = page.evaluate('''() => {
@@ -844,16 +915,14 @@ def _configure_segments(page: Page, config: V4CampaignConfig):
         # Click the visible onoffswitch label (same pattern as OS targeting)
         try:
             page.click('.onoffswitch-label[data-input="#segment_targeting"]', timeout=5000)
-        except Exception:
+        except PlaywrightError:
             # Fallback: try other label patterns
             try:
                 page.click('#campaign_segmentTargeting .onoffswitch-label', timeout=3000)
-            except Exception:
+            except PlaywrightError:
                 # Last resort: use enable_toggle
                 enable_toggle(page, "campaign_segmentTargeting")
-        time.sleep(1.5)
-    else:
-        time.sleep(0.5)
+    wait_stable(page, SEGMENT_LINK_INCLUDED, timeout=3000, state="attached")
 
     segments = [s.strip() for s in config.segment_targeting.split(";") if s.strip()]
 
@@ -866,7 +935,6 @@ def _configure_segments(page: Page, config: V4CampaignConfig):
             );
             removeLinks.forEach(a => a.click());
         }''')
-        time.sleep(0.5)
 
         # Scroll to segment section and click via JS (section may be collapsed)
         clicked = page.evaluate('''() => {
@@ -879,42 +947,17 @@ def _configure_segments(page: Page, config: V4CampaignConfig):
         if not clicked:
             logger.warning("    Select segment link not found via JS")
             return
-        time.sleep(2)
 
         # Wait for modal to fully load (not just "Loading...")
-        for _ in range(15):
-            loading = page.evaluate('''() => {
-                const modals = document.querySelectorAll('[class*="modal"]');
-                for (const m of modals) {
-                    if (m.offsetHeight > 0 && m.innerText.includes("Loading")) return true;
-                }
-                return false;
-            }''')
-            if not loading:
-                break
-            time.sleep(1)
-        time.sleep(1)
-
-        search_input = page.locator('input[placeholder*="VOD"], input[placeholder*="Try"]').first
+        search_input = page.locator(SEGMENT_SEARCH).first
+        search_input.wait_for(state="visible", timeout=15000)
+        _wait_modal_text(page)
 
         for segment_name in segments:
             search_input.fill("")
             search_input.fill(segment_name)
-            time.sleep(1)
-
             # Wait for search results to load
-            for _ in range(10):
-                loading = page.evaluate('''() => {
-                    const modals = document.querySelectorAll('[class*="modal"]');
-                    for (const m of modals) {
-                        if (m.offsetHeight > 0 && m.innerText.includes("Loading")) return true;
-                    }
-                    return false;
-                }''')
-                if not loading:
-                    break
-                time.sleep(1)
-            time.sleep(0.5)
+            _wait_modal_text(page, segment_name, timeout=10000)
 
             # Click checkbox via JS (find item containing the segment name text)
             checked = page.evaluate('''(name) => {
@@ -949,7 +992,7 @@ def _configure_segments(page: Page, config: V4CampaignConfig):
             }
             return false;
         }''')
-        time.sleep(1)
+        wait_stable(page, SEGMENT_SEARCH, timeout=3000, state="hidden")
 
         logger.info(f"    Segment targeting: {len(segments)} segment(s) configured")
     except Exception as e:
@@ -974,28 +1017,16 @@ def _configure_segments_exclude(page: Page, segment_exclude_str: str):
         if not clicked:
             logger.warning("    Exclude segment link not found")
             return
-        time.sleep(2)
 
         # Wait for modal to load
-        for _ in range(15):
-            loading = page.evaluate('''() => {
-                const modals = document.querySelectorAll('[class*="modal"]');
-                for (const m of modals) {
-                    if (m.offsetHeight > 0 && m.innerText.includes("Loading")) return true;
-                }
-                return false;
-            }''')
-            if not loading:
-                break
-            time.sleep(1)
-        time.sleep(1)
-
-        search_input = page.locator('input[placeholder*="VOD"], input[placeholder*="Try"]').first
+        search_input = page.locator(SEGMENT_SEARCH).first
+        search_input.wait_for(state="visible", timeout=15000)
+        _wait_modal_text(page)
 
         for segment_name in segments:
             search_input.fill("")
             search_input.fill(segment_name)
-            time.sleep(1.5)
+            _wait_modal_text(page, segment_name, timeout=10000)
 
             checked = page.evaluate('''(name) => {
                 const items = document.querySelectorAll('label, li, [class*="segment"]');
@@ -1025,7 +1056,7 @@ def _configure_segments_exclude(page: Page, segment_exclude_str: str):
             }
             return false;
         }''')
-        time.sleep(1)
+        wait_stable(page, SEGMENT_SEARCH, timeout=3000, state="hidden")
         logger.info(f"    Segment exclude: {len(segments)} segment(s) excluded")
     except Exception as e:
         logger.warning(f"    Could not set segment exclude: {e}")
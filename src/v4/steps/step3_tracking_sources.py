@@ -1,56 +1,68 @@
 """Step 3 — Tracking, Smart Bidder, Sources & Bids."""
 
-import time
 import logging
-from playwright.sync_api import Page
+from typing import List
+from playwright.sync_api import Error as PlaywrightError, Page, TimeoutError as PlaywrightTimeout
 
 from ..models import V4CampaignConfig
-from ..utils import safe_click, wait_and_fill, select2_choose, enable_toggle
+from ..utils import safe_click, select2_choose, enable_toggle, wait_stable
 
 logger = logging.getLogger(__name__)
 
+# ── Selectors ─────────────────────────────────────────────────────
+TRACKER_COMBO = '#campaignTrackerId + .select2-container, span[id*="campaignTrackerId"]'
+MANUAL_RADIO = 'label:has(#is_manual_source_selection_manually)'
+STEP3_READY = f'#campaignTrackerId, {MANUAL_RADIO}'
+SOURCE_LEN_SELECT = 'select[name="sourceSelectionTable_length"]'
+SOURCE_ROW = '#sourceSelectionTable tbody tr'
+SOURCE_ROW_CELL = f'{SOURCE_ROW} td.minWidth100'
+SOURCE_SELECT_ALL = 'input.checkUncheckAll[data-table="sourceSelectionTable"]'
+INCLUDE_BTN = 'button.includeBtn[data-btn-action="include"]'
+INCLUDED_ROW = '#sourceSelectionTable .sourceStatusWrap[data-status="included"]'
+INCLUDED_LEN_SELECT = 'select[name="includedSourcesTable_length"]'
+INCLUDED_SELECT_ALL = 'input.checkUncheckAll[data-table="includedSourcesTable"]'
+INLINE_INPUT = 'input#inlineEditInput, input.inlineEditInput'
+REFRESH_LINK_XPATH = '//a[normalize-space(.)="Refresh"]'
+BIDDING_CONFIRM_BTN = '.customAlertBox .smallButton.greenButton'
+BULK_CONTINUE = 'a[data-function="sourceTableFunctions.bulkEditBids"]'
+
 
 def configure_step3(page: Page, config: V4CampaignConfig):
     """Configure tracking, bidder, sources, and bid values on Step 3."""
     logger.info("  [Step 3] Configuring tracking & sources...")
 
+    # Wait for the DOM, then for the first form controls we touch (networkidle
+    # rarely settles on this page — it beacons telemetry continuously)
     try:
-        page.wait_for_load_state("networkidle", timeout=15000)
+        page.wait_for_load_state("domcontentloaded", timeout=15000)
     except Exception:
         pass
-    time.sleep(2)
+    if not wait_stable(page, STEP3_READY, timeout=15000, state="attached"):
+        logger.warning("    Step 3 form not found after 15s — continuing anyway")
 
     # ── Conversion Tracker(s) ─────────────────────────────────────
-    if config.tracker_id:
-        sep = ";" if ";" in config.tracker_id else ","
-        trackers = [t.strip() for t in config.tracker_id.split(sep) if t.strip()]
-        for tracker_name in trackers:
-            try:
-                select2_choose(
-                    page,
-                    '#campaignTrackerId + .select2-container, '
-                    'span[id*="campaignTrackerId"]',
-                    tracker_name,
-                )
-                logger.info(f"    Tracker: {tracker_name}")
-            except Exception as e:
-                logger.warning(f"    Could not set tracker '{tracker_name}': {e}")
+    for tracker_name in config.tracker_ids:
+        try:
+            select2_choose(page, TRACKER_COMBO, tracker_name)
+            logger.info(f"    Tracker: {tracker_name}")
+        except Exception as e:
+            logger.warning(f"    Could not set tracker '{tracker_name}': {e}")
 
     # ── Sources (Manual must be selected before smart bidder is visible) ─
     _select_manual_sources(page)
 
     # Include sources — filtered by source_selection or all
-    ss = (config.source_selection or "").strip()
-    if ss and ss.upper() != "ALL":
-        # Support multiple sources separated by semicolons (e.g. "Tube8;Redtube")
-        terms = [t.strip() for t in ss.split(";") if t.strip()]
-        for term in terms:
-            _include_matching_sources(page, term)
+    if config.include_all_sources_effective:
+        included = _include_all_sources(page)
     else:
-        _include_all_sources(page)
+        # Multiple sources may be separated by semicolons (e.g. "Tube8;Redtube")
+        included = _include_matching_sources(page, config.source_terms)
 
-    # Always refresh after source inclusion to get accurate suggested CPMs
-    _refresh_sources(page)
+    # Refresh after source inclusion to get accurate suggested CPMs
+    if included:
+        _refresh_sources(page)
+    else:
+        logger.info("    No sources included — skipping refresh")
 
     # ── Smart Bidder (requires Manual mode + sources included) ────
     if config.smart_bidder:
@@ -63,6 +75,11 @@ def configure_step3(page: Page, config: V4CampaignConfig):
         _configure_cpm_bids(page, config)
 
 
+def _wait_gone(page: Page, selector: str, timeout: int = 3000) -> bool:
+    """Wait for *selector* to be hidden or removed; return False on timeout."""
+    return wait_stable(page, selector, timeout=timeout, state="hidden")
+
+
 def _configure_smart_bidder(page: Page, config: V4CampaignConfig):
     """Enable smart bidder toggle and select bidding mode + optimization.
 
@@ -79,65 +96,88 @@ def _configure_smart_bidder(page: Page, config: V4CampaignConfig):
         }''')
 
         if not is_on:
+            # Built before the toggle so the confirm click fires as soon as the dialog renders
+            ok_btn = page.locator(BIDDING_CONFIRM_BTN)
             page.click('.onoffswitch-label[data-input="#automatic_bidding"]')
-            time.sleep(1)
 
             # Confirm the "AUTOMATE BIDDING?" custom alert dialog
             try:
-                ok_btn = page.locator('.customAlertBox .smallButton.greenButton')
-                ok_btn.click(timeout=5000)
-                time.sleep(0.5)
-                logger.info("    Automatic bidding: ON (confirmed)")
-            except Exception:
+                ok_btn.wait_for(state="visible", timeout=2000)
+            except PlaywrightTimeout:
                 logger.info("    Automatic bidding: ON (no confirm dialog)")
+            else:
+                ok_btn.click()
+                _wait_gone(page, '.customAlertBox', timeout=2000)
+                logger.info("    Automatic bidding: ON (confirmed)")
         else:
             logger.info("    Automatic bidding: already ON")
 
         # Select bidding mode — click the parent <label>, not the radio
         bidder = config.smart_bidder.lower()
-        if bidder == "smart_cpm":
-            page.click('label:has(#is_bidder_on_smart_cpm)')
-        elif bidder == "smart_cpa":
-            page.click('label:has(#is_bidder_on_smart_cpa)')
-        time.sleep(0.3)
+        if bidder in ("smart_cpm", "smart_cpa"):
+            page.click(f'label:has(#is_bidder_on_{bidder})')
+            wait_stable(page, f'#is_bidder_on_{bidder}:checked', timeout=1500, state="attached")
 
-        # Select optimization option — only visible for smart_cpa, not smart_cpm
+        # Select optimization option — only visible for smart_cpa, not smart_cpm.
+        # click() waits for the option block the bidder radio reveals.
         if config.optimization_option and bidder != "smart_cpm":
             opt = config.optimization_option.lower()
-            time.sleep(1)
+            option = page.locator(f'label:has(#optimization_option_{opt})')
             try:
-                page.click(f'label:has(#optimization_option_{opt})', timeout=5000)
+                option.click(timeout=5000)
             except Exception:
                 try:
-                    page.locator(f'label:has(#optimization_option_{opt})').click(force=True)
+                    option.click(force=True)
                 except Exception:
                     logger.debug(f"    Optimization option '{opt}' not available")
-            time.sleep(0.3)
+            wait_stable(page, f'#optimization_option_{opt}:checked', timeout=1500, state="attached")
 
         logger.info(f"    Smart bidder: {config.smart_bidder} / {config.optimization_option}")
     except Exception as e:
         logger.warning(f"    Could not set smart bidder: {e}")
 
 
-def _configure_cpa_bids(page: Page, config: V4CampaignConfig):
-    """Fill CPA bid fields: target CPA, per-source test budget, max bid."""
-    try:
-        wait_and_fill(page, 'input#target_cpa', str(config.target_cpa))
-        logger.info(f"    Target CPA: {config.target_cpa}")
-    except Exception:
-        pass
+# Set {id: value} on inputs and fire input/change; returns the ids that were found
+_FILL_INPUTS_JS = '''(values) => {
+    const filled = [];
+    for (const [id, v] of Object.entries(values)) {
+        const el = document.getElementById(id);
+        if (!el) continue;
+        el.value = v;
+        el.dispatchEvent(new Event("input", {bubbles: true}));
+        el.dispatchEvent(new Event("change", {bubbles: true}));
+        filled.push(id);
+    }
+    return filled;
+}'''
 
-    try:
-        wait_and_fill(page, 'input#per_source_test_budget', str(config.per_source_test_budget))
-        logger.info(f"    Per-source test budget: {config.per_source_test_budget}")
-    except Exception:
-        pass
 
+def _configure_cpa_bids(page: Page, config: V4CampaignConfig):
+    """Fill CPA bid fields: target CPA, per-source test budget, max bid.
+
+    All three inputs are written in one JS pass once #target_cpa is visible;
+    fields missing from the page are skipped, as before.
+    """
+    values = {
+        "target_cpa": str(config.target_cpa),
+        "per_source_test_budget": str(config.per_source_test_budget),
+        "maximum_bid": str(config.max_bid),
+    }
+    if not wait_stable(page, 'input#target_cpa', timeout=5000):
+        logger.debug("    Target CPA input not visible after 5s")
     try:
-        wait_and_fill(page, 'input#maximum_bid', str(config.max_bid))
-        logger.info(f"    Max bid: {config.max_bid}")
-    except Exception:
-        pass
+        filled = page.evaluate(_FILL_INPUTS_JS, values)
+    except PlaywrightError as e:
+        logger.warning(f"    Could not fill CPA bids: {e}")
+        return
+    if filled:
+        logger.info(
+            f"    Target CPA: {config.target_cpa} / per-source test budget: "
+            f"{config.per_source_test_budget} / max bid: {config.max_bid}"
+        )
+    missing = [k for k in values if k not in filled]
+    if missing:
+        logger.debug(f"    CPA fields not on page: {', '.join(missing)}")
 
 
 def _configure_cpm_bids(page: Page, config: V4CampaignConfig):
@@ -150,14 +190,10 @@ def _configure_cpm_bids(page: Page, config: V4CampaignConfig):
     mode = (config.cpm_bid_mode or "suggested").lower()
 
     try:
-        time.sleep(2)
+        wait_stable(page, INCLUDED_LEN_SELECT, timeout=5000, state="attached")
 
         # Show all included sources
-        try:
-            page.select_option('select[name="includedSourcesTable_length"]', '100')
-            time.sleep(1)
-        except Exception:
-            pass
+        _show_all_rows(page, "includedSourcesTable", INCLUDED_LEN_SELECT)
 
         # Select all included source checkboxes
         _select_all_included_sources(page)
@@ -173,19 +209,44 @@ def _configure_cpm_bids(page: Page, config: V4CampaignConfig):
         logger.warning(f"    CPM bid configuration failed: {e}")
 
 
+# Show all rows via the DataTables API: "sync"/"ajax" draw, or "" if not a DataTable
+_SHOW_ALL_ROWS_JS = '''(tableId) => {
+    const $ = window.jQuery;
+    const table = document.getElementById(tableId);
+    if (!table || !$ || !$.fn.DataTable || !$.fn.DataTable.isDataTable(table)) return "";
+    const dt = $(table).DataTable();
+    dt.page.len(-1).draw(false);
+    return dt.settings()[0].oFeatures.bServerSide ? "ajax" : "sync";
+}'''
+
+
+def _show_all_rows(page: Page, table_id: str, length_select: str):
+    """Show every row of a DataTable via its API; fall back to the 100-rows <select>.
+
+    A client-side draw is synchronous, so only a server-side table (or the
+    <select> fallback) waits — on DataTables' own processing indicator.
+    """
+    try:
+        drawn = page.evaluate(_SHOW_ALL_ROWS_JS, table_id)
+        if not drawn:
+            page.select_option(length_select, '100')
+    except PlaywrightError:
+        return
+    if drawn != "sync":
+        wait_stable(page, f'#{table_id}_processing', timeout=3000, state="hidden")
+
+
 def _select_all_included_sources(page: Page):
     """Check all included source checkboxes."""
-    select_all = page.query_selector('input.checkUncheckAll[data-table="includedSourcesTable"]')
-    if select_all:
-        select_all.click()
-        time.sleep(0.5)
+    try:
+        page.click(INCLUDED_SELECT_ALL, timeout=3000)
+        wait_stable(page, 'input.tableCheckbox[data-source-id]:checked', timeout=1500, state="attached")
         logger.info("    Selected all included sources")
-    else:
+    except PlaywrightTimeout:
         checkboxes = page.query_selector_all('input.tableCheckbox[data-source-id]')
         for cb in checkboxes:
             if not cb.is_checked():
                 cb.click()
-                time.sleep(0.1)
         logger.info(f"    Selected {len(checkboxes)} source checkboxes")
 
 
@@ -262,6 +323,55 @@ def _apply_static_cpm_bids(page: Page, config: V4CampaignConfig):
     logger.info(f"    Set {count}/{len(sources)} sources to static ${static_val:.2f} (floored at min CPM)")
 
 
+# Included source rows as [{tableId, rowIdx, minCpm}] — sub-tables on multi-geo
+_INCLUDED_BIDS_JS = '''() => {
+    const result = [];
+    // Only the row's own right-aligned cells — not every td beneath it
+    const PRICE_RE = /^\\s*[$]([\\d.]+)/;
+    const minCpmOf = (row) => {
+        for (const cell of row.querySelectorAll(":scope > td.text-right")) {
+            const m = PRICE_RE.exec(cell.textContent);
+            if (m) return parseFloat(m[1]) || 0;
+        }
+        return 0;
+    };
+
+    // Check for sub-tables first (multi-geo layout)
+    const subTables = document.querySelectorAll('table[id^="sourceSelectionSubTable"]');
+    if (subTables.length > 0) {
+        subTables.forEach(table => {
+            const rows = table.querySelectorAll("tbody tr");
+            rows.forEach((row, idx) => {
+                // Skip header rows (no td cells or no yourCPM)
+                if (!row.querySelector("td.yourCPM")) return;
+                if (!row.querySelector("i.fa-pencil-alt, .pencil-icon")) return;
+
+                result.push({tableId: table.id, rowIdx: idx, minCpm: minCpmOf(row)});
+            });
+        });
+        return result;
+    }
+
+    // Fallback: single-geo layout — rows are in main table
+    const table = document.querySelector("#sourceSelectionTable") ||
+                  document.querySelector("#includedSourcesTable");
+    if (!table) return result;
+    const rows = table.querySelectorAll("tbody tr");
+    rows.forEach((row, idx) => {
+        const sw = row.querySelector(".sourceStatusWrap");
+        if (sw && sw.getAttribute("data-status") !== "included") return;
+        if (!row.querySelector("i.fa-pencil-alt, .pencil-icon")) return;
+
+        result.push({tableId: table.id, rowIdx: idx, minCpm: minCpmOf(row)});
+    });
+    return result;
+}'''
+# Truthy (the rows) once at least one min CPM has rendered — for wait_for_function
+_INCLUDED_BIDS_READY_JS = (
+    f"() => {{ const r = ({_INCLUDED_BIDS_JS})(); return r.some(s => s.minCpm > 0) ? r : false; }}"
+)
+
+
 def _get_included_source_bids(page: Page):
     """Get all included source rows with their min CPMs.
 
@@ -269,54 +379,28 @@ def _get_included_source_bids(page: Page):
     per-country rows. Single-geo uses the main sourceSelectionTable directly.
     Returns list of {tableId, rowIdx, minCpm} for each included bid row.
     """
-    # Wait for sub-tables to load
-    time.sleep(3)
-
-    return page.evaluate('''() => {
-        const result = [];
-
-        // Check for sub-tables first (multi-geo layout)
-        const subTables = document.querySelectorAll('table[id^="sourceSelectionSubTable"]');
-        if (subTables.length > 0) {
-            subTables.forEach(table => {
-                const rows = table.querySelectorAll("tbody tr");
-                rows.forEach((row, idx) => {
-                    // Skip header rows (no td cells or no yourCPM)
-                    if (!row.querySelector("td.yourCPM")) return;
-                    if (!row.querySelector("i.fa-pencil-alt, .pencil-icon")) return;
-
-                    let minCpm = 0;
-                    const priceCells = row.querySelectorAll("td.text-right");
-                    for (const cell of priceCells) {
-                        const m = cell.textContent.trim().match(/^[$]([\\d.]+)/);
-                        if (m) { minCpm = parseFloat(m[1]) || 0; break; }
-                    }
-                    result.push({tableId: table.id, rowIdx: idx, minCpm});
-                });
-            });
-            return result;
-        }
-
-        // Fallback: single-geo layout — rows are in main table
-        const table = document.querySelector("#sourceSelectionTable") ||
-                      document.querySelector("#includedSourcesTable");
-        if (!table) return result;
-        const rows = table.querySelectorAll("tbody tr");
-        rows.forEach((row, idx) => {
-            const sw = row.querySelector(".sourceStatusWrap");
-            if (sw && sw.getAttribute("data-status") !== "included") return;
-            if (!row.querySelector("i.fa-pencil-alt, .pencil-icon")) return;
-
-            let minCpm = 0;
-            const priceCells = row.querySelectorAll("td.text-right");
-            for (const cell of priceCells) {
-                const m = cell.textContent.trim().match(/^[$]([\\d.]+)/);
-                if (m) { minCpm = parseFloat(m[1]) || 0; break; }
-            }
-            result.push({tableId: table.id, rowIdx: idx, minCpm});
-        });
-        return result;
-    }''')
+    # Poll until the (sub-)table rows render with their min CPMs, and return
+    # them from the same call — no separate settle wait before the read
+    try:
+        return page.wait_for_function(_INCLUDED_BIDS_READY_JS, timeout=5000).json_value()
+    except PlaywrightTimeout:
+        logger.warning("    Included source CPMs not populated after 5s")
+        return page.evaluate(_INCLUDED_BIDS_JS)
+
+
+# Open the inline bid editor on row {tableId, rowIdx} (pencil icon, else the CPM cell)
+_OPEN_INLINE_EDIT_JS = '''(args) => {
+    const table = document.getElementById(args.tableId);
+    if (!table) return false;
+    const rows = table.querySelectorAll("tbody tr");
+    if (args.rowIdx >= rows.length) return false;
+    const row = rows[args.rowIdx];
+    const pencil = row.querySelector("i.fa-pencil-alt, i.pencil-icon, .pencil-icon");
+    if (pencil) { pencil.click(); return true; }
+    const cpmCell = row.querySelector("td.yourCPM");
+    if (cpmCell) { cpmCell.click(); return true; }
+    return false;
+}'''
 
 
 def _set_source_bid_inline(page: Page, table_id: str, row_idx: int, bid: float) -> bool:
@@ -327,39 +411,19 @@ def _set_source_bid_inline(page: Page, table_id: str, row_idx: int, bid: float)
     3. Click Save or press Enter
     """
     try:
-        clicked = page.evaluate('''(args) => {
-            const table = document.getElementById(args.tableId);
-            if (!table) return false;
-            const rows = table.querySelectorAll("tbody tr");
-            if (args.rowIdx >= rows.length) return false;
-            const row = rows[args.rowIdx];
-            const pencil = row.querySelector("i.fa-pencil-alt, i.pencil-icon, .pencil-icon");
-            if (pencil) { pencil.click(); return true; }
-            const cpmCell = row.querySelector("td.yourCPM");
-            if (cpmCell) { cpmCell.click(); return true; }
-            return false;
-        }''', {"tableId": table_id, "rowIdx": row_idx})
+        clicked = page.evaluate(_OPEN_INLINE_EDIT_JS, {"tableId": table_id, "rowIdx": row_idx})
 
         if not clicked:
             return False
 
-        time.sleep(0.5)
-
-        input_el = page.query_selector('input#inlineEditInput, input.inlineEditInput')
-        if not input_el:
-            time.sleep(0.5)
-            input_el = page.query_selector('input#inlineEditInput, input.inlineEditInput')
-        if not input_el:
+        try:
+            input_el = page.wait_for_selector(INLINE_INPUT, state="visible", timeout=2000)
+        except Exception:
             return False
 
-        input_el.fill("")
+        # fill() focuses, clears and fires "input"; "change" enables the Save button
         input_el.fill(str(bid))
-        time.sleep(0.3)
-
-        # Trigger input/change events to enable Save button
-        input_el.dispatch_event("input")
         input_el.dispatch_event("change")
-        time.sleep(0.3)
 
         # Try Enter key first (most reliable), then Save button via JS
         try:
@@ -370,7 +434,7 @@ def _set_source_bid_inline(page: Page, table_id: str, row_idx: int, bid: float)
                 if (btn) btn.click();
             }''')
 
-        time.sleep(0.5)
+        _wait_gone(page, INLINE_INPUT, timeout=2000)
         return True
 
     except Exception as e:
@@ -378,27 +442,33 @@ def _set_source_bid_inline(page: Page, table_id: str, row_idx: int, bid: float)
         return False
 
 
-def _click_match_suggested_cpm(page: Page):
-    """Click 'Match Suggested CPM' button to populate all bids."""
-    matched = page.evaluate('''() => {
-        const btn = document.querySelector("button.matchCpm");
-        if (btn) {
-            btn.scrollIntoView({behavior: "instant", block: "center"});
-            btn.click();
+# Tag the Your CPM cells, then click Match Suggested CPM (by class, else by text)
+_MATCH_CPM_JS = '''() => {
+    document.querySelectorAll("td.yourCPM").forEach(td => { td.dataset.preMatch = "1"; });
+    const btn = document.querySelector("button.matchCpm");
+    if (btn) {
+        btn.scrollIntoView({behavior: "instant", block: "center"});
+        btn.click();
+        return true;
+    }
+    const buttons = document.querySelectorAll("button");
+    for (const b of buttons) {
+        if (b.textContent.includes("Match") && b.textContent.includes("CPM")) {
+            b.scrollIntoView({behavior: "instant", block: "center"});
+            b.click();
             return true;
         }
-        const buttons = document.querySelectorAll("button");
-        for (const b of buttons) {
-            if (b.textContent.includes("Match") && b.textContent.includes("CPM")) {
-                b.scrollIntoView({behavior: "instant", block: "center"});
-                b.click();
-                return true;
-            }
-        }
-        return false;
-    }''')
+    }
+    return false;
+}'''
+
+
+def _click_match_suggested_cpm(page: Page):
+    """Click 'Match Suggested CPM' button to populate all bids."""
+    matched = page.evaluate(_MATCH_CPM_JS)
     if matched:
-        time.sleep(2)
+        # Bids are applied once the table redraws its Your CPM cells
+        wait_stable(page, 'td.yourCPM:not([data-pre-match])', timeout=2000, state="attached")
         logger.info("    Matched suggested CPM")
     else:
         logger.warning("    Match Suggested CPM button not found")
@@ -406,47 +476,40 @@ def _click_match_suggested_cpm(page: Page):
 
 def _bulk_adjust_by_percentage(page: Page, percentage: int):
     """Bulk Edit → Adjust by Percentage flow."""
-    bulk_edit = page.query_selector('button.bulkEdit')
-    if not bulk_edit:
+    try:
+        page.click('button.bulkEdit', timeout=3000)
+    except PlaywrightTimeout:
         logger.warning("    Bulk Edit button not found")
         return
 
-    bulk_edit.click()
-    time.sleep(0.5)
-
+    # click()/fill() auto-wait for the modal's controls
     page.click('label:has(input#adjustByPercent)')
-    time.sleep(0.3)
 
     percent_input = page.query_selector('input#percent')
     if percent_input:
-        percent_input.fill("")
         percent_input.fill(str(percentage))
-        time.sleep(0.3)
         page.click('label:has(input#adjustByPercent)')
-        time.sleep(0.5)
 
     confirm = page.query_selector('button#confirmBulkEdit')
     if confirm:
         confirm.click()
-        time.sleep(1)
+        wait_stable(page, f'{BULK_CONTINUE}, a.greenButton:has-text("Continue")', timeout=3000)
 
-    continue_btn = page.query_selector('a[data-function="sourceTableFunctions.bulkEditBids"]')
+    continue_btn = page.query_selector(BULK_CONTINUE)
     if continue_btn:
         continue_btn.click()
-        time.sleep(1)
+        _wait_gone(page, BULK_CONTINUE)
     else:
         try:
             page.click('a.greenButton:has-text("Continue")', timeout=3000)
-            time.sleep(1)
+            _wait_gone(page, 'a.greenButton:has-text("Continue")')
         except Exception:
             pass
 
     # Dismiss modal
     try:
         page.click('body', position={"x": 10, "y": 10}, force=True)
-        time.sleep(0.3)
         page.keyboard.press('Escape')
-        time.sleep(0.3)
     except Exception:
         pass
 
@@ -458,112 +521,136 @@ def _select_manual_sources(page: Page):
     After switching, wait for the source table to load.
     """
     try:
-        page.click('label:has(#is_manual_source_selection_manually)')
-        time.sleep(1)
+        page.click(MANUAL_RADIO)
         # Wait for source selection table to appear
-        try:
-            page.wait_for_selector(
-                'select[name="sourceSelectionTable_length"]',
-                state="visible", timeout=10000,
-            )
-            time.sleep(1)
-        except Exception:
-            time.sleep(2)
+        if not wait_stable(page, SOURCE_LEN_SELECT, timeout=10000):
+            logger.warning("    Source table controls not visible after 10s")
         logger.info("    Sources: switched to manual selection")
     except Exception as e:
         logger.warning(f"    Could not switch to manual sources: {e}")
 
 
-def _include_all_sources(page: Page):
-    """Wait for source table rows to load, check all, and click Include."""
+# Tick the check-all box, click Include, return the row count (0 if controls missing)
+_INCLUDE_ALL_JS = '''([allSel, includeSel, rowSel]) => {
+    const cb = document.querySelector(allSel);
+    const btn = document.querySelector(includeSel);
+    if (!cb || !btn) return 0;
+    if (!cb.checked) cb.click();
+    btn.click();
+    return document.querySelectorAll(rowSel).length;
+}'''
+
+
+def _include_all_sources(page: Page) -> int:
+    """Wait for source table rows to load, check all, and click Include.
+
+    Returns the number of source rows included (0 on failure).
+    """
     try:
         # Wait for at least one source row to appear (table loads async)
         try:
-            page.wait_for_selector(
-                '#sourceSelectionTable tbody tr td.minWidth100',
-                state="visible", timeout=15000,
-            )
-            time.sleep(1)
+            page.wait_for_selector(SOURCE_ROW_CELL, state="visible", timeout=15000)
         except Exception:
             logger.warning("    Source table rows not loaded after 15s")
-            return
+            return 0
 
-        source_checkbox = page.locator(
-            'input.checkUncheckAll[data-table="sourceSelectionTable"]'
-        )
-        if source_checkbox.is_visible(timeout=3000):
-            page.check('input.checkUncheckAll[data-table="sourceSelectionTable"]')
-            time.sleep(0.5)
-            page.click('button.includeBtn[data-btn-action="include"]')
-            time.sleep(1)
+        # One DOM pass: tick the header checkbox, click Include, count the rows
+        rows = page.evaluate(_INCLUDE_ALL_JS, [SOURCE_SELECT_ALL, INCLUDE_BTN, SOURCE_ROW])
+        if rows:
+            wait_stable(page, INCLUDED_ROW, timeout=5000, state="attached")
             logger.info("    Sources: all included")
-        else:
-            logger.warning("    Source select-all checkbox not found on page")
+            return rows
+        logger.warning("    Source select-all checkbox not found on page")
     except Exception as e:
         logger.warning(f"    Source inclusion failed: {e}")
+    return 0
+
+
+# Check rows whose site name contains any needle, click Include; returns the matched names
+_INCLUDE_MATCHING_JS = '''([needles, rowSel, includeSel]) => {
+    const names = [];
+    for (const row of document.querySelectorAll(rowSel)) {
+        const siteCell = row.querySelector("td.minWidth100");
+        if (!siteCell) continue;
+        const text = siteCell.textContent;
+        const lower = text.toLowerCase();
+        if (!needles.some(n => lower.indexOf(n) !== -1)) continue;
+        const cb = row.querySelector("input.tableCheckbox");
+        if (cb && !cb.checked) {
+            cb.checked = true;
+            cb.dispatchEvent(new Event("change", {bubbles: true}));
+            names.push(text.trim());
+        }
+    }
+    if (names.length) {
+        const btn = document.querySelector(includeSel);
+        if (btn) btn.click();
+    }
+    return names;
+}'''
+
 
+def _include_matching_sources(page: Page, terms: List[str]) -> int:
+    """Check source rows whose site name contains any of the terms, then include.
 
-def _include_matching_sources(page: Page, search_term: str):
-    """Check only source rows whose site name contains the search term, then include."""
+    All terms are matched in a single table scan and a single Include click.
+    Returns the number of rows included (0 if none matched or on failure).
+    """
+    label = ";".join(terms)
     try:
         # Wait for source table rows to load
         try:
-            page.wait_for_selector(
-                '#sourceSelectionTable tbody tr td.minWidth100',
-                state="visible", timeout=15000,
-            )
-            time.sleep(1)
+            page.wait_for_selector(SOURCE_ROW_CELL, state="visible", timeout=15000)
         except Exception:
             logger.warning("    Source table rows not loaded after 15s")
-            return
-
-        # Use JS to check only rows matching the search term
-        checked = page.evaluate('''(term) => {
-            let count = 0;
-            const rows = document.querySelectorAll("#sourceSelectionTable tbody tr");
-            for (const row of rows) {
-                const siteCell = row.querySelector("td.minWidth100");
-                if (siteCell && siteCell.textContent.toLowerCase().includes(term.toLowerCase())) {
-                    const cb = row.querySelector("input.tableCheckbox");
-                    if (cb && !cb.checked) {
-                        cb.checked = true;
-                        cb.dispatchEvent(new Event("change", {bubbles: true}));
-                        count++;
-                    }
-                }
-            }
-            return count;
-        }''', search_term)
-
-        if checked > 0:
-            time.sleep(0.5)
-            page.click('button.includeBtn[data-btn-action="include"]')
-            time.sleep(1)
-            logger.info(f"    Sources: {checked} matching '{search_term}' included")
-        else:
-            logger.warning(f"    No sources matching '{search_term}' found")
+            return 0
+
+        needles = [t.lower() for t in terms]
+        checked = page.evaluate(_INCLUDE_MATCHING_JS, [needles, SOURCE_ROW, INCLUDE_BTN])
+
+        lowered = [name.lower() for name in checked]
+        for term, needle in zip(terms, needles):
+            if not any(needle in name for name in lowered):
+                logger.warning(f"    No sources matching '{term}' found")
+        if checked:
+            wait_stable(page, INCLUDED_ROW, timeout=5000, state="attached")
+            logger.info(f"    Sources: {len(checked)} matching '{label}' included")
+            logger.debug(f"    Included: {', '.join(checked)}")
+        return len(checked)
     except Exception as e:
-        logger.warning(f"    Source matching failed for '{search_term}': {e}")
+        logger.warning(f"    Source matching failed for '{label}': {e}")
+    return 0
+
+
+# Tag the current source rows, then click the Refresh link found by XPath
+_REFRESH_JS = '''(xpath) => {
+    document.querySelectorAll(
+        "#sourceSelectionTable tbody tr, #includedSourcesTable tbody tr"
+    ).forEach(tr => { tr.dataset.preRefresh = "1"; });
+    const link = document.evaluate(
+        xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null,
+    ).singleNodeValue;
+    if (!link) return false;
+    link.click();
+    return true;
+}'''
 
 
 def _refresh_sources(page: Page):
     """Click the Refresh link to reload suggested CPM bids from server."""
     try:
-        page.evaluate('''() => {
-            const links = document.querySelectorAll("a");
-            for (const a of links) {
-                if (a.textContent.trim() === "Refresh") {
-                    a.click();
-                    return true;
-                }
-            }
-            return false;
-        }''')
-        try:
-            page.wait_for_load_state("networkidle", timeout=15000)
-        except Exception:
-            pass
-        time.sleep(2)
+        # Tag the current source rows, then click Refresh — the reload is done
+        # once DataTables has drawn rows without the tag
+        clicked = page.evaluate(_REFRESH_JS, REFRESH_LINK_XPATH)
+        if not clicked:
+            logger.warning("    Refresh link not found — using current CPM bids")
+            return
+        wait_stable(
+            page,
+            '#sourceSelectionTable tbody tr:not([data-pre-refresh]), '
+            '#includedSourcesTable tbody tr:not([data-pre-refresh])',
+            timeout=15000, state="attached",
+        )
         logger.info("    Sources: refreshed CPM bids")
     except Exception as e:
         logger.warning(f"    Could not refresh sources: {e}")
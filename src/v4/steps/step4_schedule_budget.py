@@ -1,28 +1,43 @@
 """Step 4 — Schedule & Budget: duration, dayparting, frequency cap, budget."""
 
-import time
 import logging
 from playwright.sync_api import Page
 
 from ..models import V4CampaignConfig
-from ..utils import enable_toggle, disable_toggle, dismiss_modals
+from ..utils import enable_toggles, disable_toggle, dismiss_modals, wait_ready, wait_stable
 
 logger = logging.getLogger(__name__)
 
+STEP4_READY = '#campaign_duration, #daily_budget'
+
 
 def configure_step4(page: Page, config: V4CampaignConfig):
     """Configure duration, dayparting, frequency cap, and daily budget on Step 4."""
     logger.info("  [Step 4] Configuring schedule & budget...")
 
+    # networkidle rarely settles on this dashboard — wait for the DOM and
+    # the first form controls instead
     try:
-        page.wait_for_load_state("networkidle", timeout=15000)
+        page.wait_for_load_state("domcontentloaded", timeout=10000)
     except Exception:
         pass
-    time.sleep(2)
+    if not wait_stable(page, STEP4_READY, timeout=10000, state="attached"):
+        logger.warning("    Step 4 form not found after 10s — continuing anyway")
     dismiss_modals(page)
 
+    # Switch on every section toggle this campaign needs in one JS pass
+    has_duration = bool(config.start_date or config.end_date)
+    toggles = []
+    if has_duration:
+        toggles.append("campaign_duration")
+    if config.schedule_dayparting:
+        toggles.append("campaign_schedule")
+    if config.frequency_cap != 0:
+        toggles.append("campaign_frequency_capping")
+    enable_toggles(page, toggles)
+
     # ── Duration ──────────────────────────────────────────────────
-    if config.start_date or config.end_date:
+    if has_duration:
         _configure_duration(page, config)
 
     # ── Dayparting ────────────────────────────────────────────────
@@ -38,31 +53,27 @@ def configure_step4(page: Page, config: V4CampaignConfig):
 
 
 def _configure_duration(page: Page, config: V4CampaignConfig):
-    """Enable duration toggle and fill start/end dates."""
-    enable_toggle(page, "campaign_duration")
-    time.sleep(0.5)
+    """Fill start/end dates (the duration toggle is switched on by configure_step4)."""
+    wait_ready(page, "#start_date", timeout=3000)
 
     if config.start_date:
         try:
             page.fill('#start_date', config.start_date)
-            time.sleep(0.3)
-            logger.info(f"    Start date: {config.start_date}")
+            logger.info("    Start date: %s", config.start_date)
         except Exception as e:
             logger.warning(f"    Could not set start date: {e}")
 
     if config.end_date:
         try:
             page.fill('#end_date', config.end_date)
-            time.sleep(0.3)
-            logger.info(f"    End date: {config.end_date}")
+            logger.info("    End date: %s", config.end_date)
         except Exception as e:
             logger.warning(f"    Could not set end date: {e}")
 
 
 def _configure_dayparting(page: Page, config: V4CampaignConfig):
-    """Enable schedule toggle and configure dayparting grid."""
-    enable_toggle(page, "campaign_schedule")
-    time.sleep(0.5)
+    """Configure the dayparting grid (the schedule toggle is switched on by configure_step4)."""
+    wait_stable(page, '#schedule_list', timeout=3000, state="attached")
 
     # The dayparting value is a JSON config applied via JS
     try:
@@ -73,8 +84,7 @@ def _configure_dayparting(page: Page, config: V4CampaignConfig):
                 input.dispatchEvent(new Event("change", {{bubbles: true}}));
             }}
         }}''', config.schedule_dayparting)
-        time.sleep(0.3)
-        logger.info(f"    Dayparting configured")
+        logger.info("    Dayparting configured")
     except Exception as e:
         logger.warning(f"    Could not set dayparting: {e}")
 
@@ -87,20 +97,18 @@ def _configure_frequency_cap(page: Page, config: V4CampaignConfig):
         logger.info("    Frequency capping: disabled")
         return
 
-    # Enable and set values
-    enable_toggle(page, "campaign_frequency_capping")
-    time.sleep(0.3)
+    # Toggle already switched on by configure_step4 — set values
+    wait_ready(page, 'input#frequency_cap_times', timeout=3000)
 
+    # fill() clears the field itself — no separate fill("") pass
     try:
-        page.fill('input#frequency_cap_times', "")
         page.fill('input#frequency_cap_times', str(config.frequency_cap))
-        logger.info(f"    Frequency cap: {config.frequency_cap}")
+        logger.info("    Frequency cap: %s", config.frequency_cap)
     except Exception as e:
         logger.warning(f"    Could not set frequency cap times: {e}")
 
     if config.frequency_cap_every:
         try:
-            page.fill('input#frequency_cap_every', "")
             page.fill('input#frequency_cap_every', str(config.frequency_cap_every))
             # Check if there's a unit selector (hours/days) and log current state
             unit_info = page.evaluate('''() => {
@@ -115,64 +123,73 @@ def _configure_frequency_cap(page: Page, config: V4CampaignConfig):
                 }
                 return "no unit selector found";
             }''')
-            logger.info(f"    Frequency cap every: {config.frequency_cap_every} (unit: {unit_info})")
+            logger.info("    Frequency cap every: %s (unit: %s)", config.frequency_cap_every, unit_info)
         except Exception as e:
             logger.warning(f"    Could not set frequency cap interval: {e}")
 
 
+# Select Custom, await a visible #daily_budget (force-unhiding it after 5s), set it.
+# Native events also reach jQuery-bound handlers, so no separate $().trigger pass.
+_SET_CUSTOM_BUDGET_JS = '''async (val) => {
+    const input = document.getElementById("is_unlimited_budget_custom");
+    if (input) {
+        input.checked = true;
+        input.click();
+        input.dispatchEvent(new Event("change", {bubbles: true}));
+        input.dispatchEvent(new Event("input", {bubbles: true}));
+    }
+    const label = document.querySelector('label[for="is_unlimited_budget_custom"]');
+    if (label) label.click();
+
+    const visible = () => {
+        const f = document.getElementById("daily_budget");
+        return f && f.offsetParent !== null ? f : null;
+    };
+    let f = visible() || await new Promise(resolve => {
+        const obs = new MutationObserver(() => {
+            const el = visible();
+            if (el) { obs.disconnect(); clearTimeout(timer); resolve(el); }
+        });
+        const timer = setTimeout(() => { obs.disconnect(); resolve(null); }, 5000);
+        obs.observe(document.body, {
+            subtree: true, childList: true, attributes: true, attributeFilter: ["style", "class"],
+        });
+    });
+    if (!f) {
+        f = document.getElementById("daily_budget");
+        if (!f) return {ok: false, value: null};
+        const p = f.closest("div[style*='display: none'], div.hidden, .custom-budget-section");
+        if (p) p.style.display = "";
+        f.style.display = "";
+        f.removeAttribute("disabled");
+    }
+
+    f.value = val;
+    f.dispatchEvent(new Event("input", {bubbles: true}));
+    f.dispatchEvent(new Event("change", {bubbles: true}));
+    return {ok: true, value: f.value};
+}'''
+
+
 def _configure_budget(page: Page, config: V4CampaignConfig):
-    """Select budget type (unlimited or custom) and fill daily budget if custom."""
+    """Select budget type (unlimited or custom) and fill daily budget if custom.
+
+    The custom path is one round-trip: select Custom, wait for the field, set it.
+    """
     if config.budget_type == "unlimited":
         _select_unlimited_budget(page)
         return
 
-    _select_custom_budget(page)
-
-    # Wait for budget field to appear
-    for attempt in range(3):
-        ready = page.evaluate('''() => {
-            const f = document.getElementById("daily_budget");
-            return f && f.offsetParent !== null;
-        }''')
-        if ready:
-            break
-        time.sleep(1)
-        page.evaluate('''() => {
-            const f = document.getElementById("daily_budget");
-            if (f) {
-                let p = f.closest("div[style*='display: none'], div.hidden, .custom-budget-section");
-                if (p) p.style.display = "";
-                f.style.display = "";
-                f.removeAttribute("disabled");
-            }
-        }''')
-
-    # Set budget via JS (most reliable)
     budget_val = str(config.daily_budget)
-    budget_set = page.evaluate(f'''() => {{
-        const f = document.getElementById("daily_budget");
-        if (f) {{
-            f.value = "";
-            f.value = "{budget_val}";
-            f.dispatchEvent(new Event("input", {{bubbles: true}}));
-            f.dispatchEvent(new Event("change", {{bubbles: true}}));
-            if (typeof $ !== "undefined") {{
-                try {{ $("#daily_budget").val("{budget_val}")
-                        .trigger("input").trigger("change"); }} catch(e) {{}}
-            }}
-            return true;
-        }}
-        return false;
-    }}''')
+    result = page.evaluate(_SET_CUSTOM_BUDGET_JS, budget_val)
 
-    if budget_set:
-        logger.info(f"    Daily budget: ${config.daily_budget}")
+    if result["ok"]:
+        logger.info("    Daily budget: $%s", config.daily_budget)
     else:
         # Playwright fallback
         try:
-            page.fill('input#daily_budget', "", timeout=5000)
             page.fill('input#daily_budget', budget_val, timeout=5000)
-            logger.info(f"    Daily budget: ${config.daily_budget} (fallback)")
+            logger.info("    Daily budget: $%s (fallback)", config.daily_budget)
         except Exception:
             logger.warning("    Could not set daily budget — template value will be used")
 
@@ -188,12 +205,6 @@ def _select_unlimited_budget(page: Page):
             input.click();
             input.dispatchEvent(new Event("change", {bubbles: true}));
         }
-        if (typeof $ !== "undefined") {
-            try {
-                $("#is_unlimited_budget_unlimited, #is_unlimited_budget")
-                    .prop("checked", true).trigger("click").trigger("change");
-            } catch(e) {}
-        }
         // Try clicking label
         const label = document.querySelector(
             'label[for="is_unlimited_budget_unlimited"], label[for="is_unlimited_budget"]'
@@ -210,25 +221,8 @@ def _select_unlimited_budget(page: Page):
             }
         }
     }''')
-    time.sleep(1)
+    wait_stable(
+        page, '#is_unlimited_budget_unlimited:checked, #is_unlimited_budget:checked',
+        timeout=1500, state="attached",
+    )
     logger.info("    Budget: unlimited")
-
-
-def _select_custom_budget(page: Page):
-    """Select the Custom budget radio button."""
-    page.evaluate('''() => {
-        const input = document.getElementById("is_unlimited_budget_custom");
-        if (input) {
-            input.checked = true;
-            input.click();
-            input.dispatchEvent(new Event("change", {bubbles: true}));
-            input.dispatchEvent(new Event("input", {bubbles: true}));
-        }
-        if (typeof $ !== "undefined") {
-            try { $("#is_unlimited_budget_custom").prop("checked", true)
-                    .trigger("click").trigger("change"); } catch(e) {}
-        }
-        const label = document.querySelector('label[for="is_unlimited_budget_custom"]');
-        if (label) label.click();
-    }''')
-    time.sleep(1)
@@ -5,13 +5,15 @@ import tempfile
 import time
 import logging
 from pathlib import Path
-from playwright.sync_api import Page
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
 
 from ..models import V4CampaignConfig
-from ..utils import dismiss_modals
+from ..utils import dismiss_modals, rearm_dismiss_modals, wait_ready, wait_stable
 
 logger = logging.getLogger(__name__)
 
+STEP5_READY = 'select[name="adsTable_length"], #massAdsCsv, input[type="file"]'
+
 # Minimum required columns per format (must be non-empty)
 REQUIRED_BY_FORMAT = {
     "native": {"Ad Name", "Target URL", "Video Creative ID", "Thumbnail Creative ID", "Headline", "Brand Name"},
@@ -24,11 +26,14 @@ def configure_step5(page: Page, config: V4CampaignConfig, csv_dir: str, campaign
     """Delete existing ads, upload ad CSV, and configure ad rotation."""
     logger.info("  [Step 5] Configuring ad settings...")
 
+    # networkidle rarely settles on this dashboard — wait for the DOM and
+    # the first form controls instead
     try:
-        page.wait_for_load_state("networkidle", timeout=15000)
+        page.wait_for_load_state("domcontentloaded", timeout=10000)
     except Exception:
         pass
-    time.sleep(2)
+    if not wait_stable(page, STEP5_READY, timeout=10000, state="attached"):
+        logger.warning("    Step 5 form not found after 10s — continuing anyway")
     dismiss_modals(page)
 
     is_pop = config.ad_format_type == "pop"
@@ -173,10 +178,10 @@ def _validate_and_clean_csv(csv_path: Path) -> Path:
         )
         tmp.write(buf.getvalue())
         tmp.close()
-        logger.info(f"    Cleaned CSV: {len(cleaned_rows)} valid rows → {tmp.name}")
+        logger.info("    Cleaned CSV: %s valid rows → %s", len(cleaned_rows), tmp.name)
         return Path(tmp.name)
 
-    logger.info(f"    CSV validated OK: {len(cleaned_rows)} rows in {csv_path.name}")
+    logger.info("    CSV validated OK: %s rows in %s", len(cleaned_rows), csv_path.name)
     return csv_path
 
 
@@ -191,7 +196,7 @@ def _upload_pop_csv(page: Page, csv_path: Path):
     """
     try:
         dismiss_modals(page)
-        time.sleep(1)
+        wait_ready(page)
 
         # Select "Mass create with CSV" radio
         clicked = page.evaluate("""() => {
@@ -217,14 +222,14 @@ def _upload_pop_csv(page: Page, csv_path: Path):
             return false;
         }""")
         if clicked:
-            time.sleep(1)
+            wait_stable(page, 'input[type="file"]', timeout=3000, state="attached")
             logger.info("    Pop: selected mass CSV upload")
 
         # Upload the CSV file
         file_input = page.locator('input[type="file"]').first
         file_input.set_input_files(str(csv_path))
-        time.sleep(2)
-        logger.info(f"    Pop: CSV file set: {csv_path.name}")
+        wait_stable(page, 'button:has-text("Preview"), a.smallButton:has-text("Preview")', timeout=3000)
+        logger.info("    Pop: CSV file set: %s", csv_path.name)
 
         # Step 1: Click "Create CSV Preview" button
         page.evaluate("""() => {
@@ -248,7 +253,7 @@ def _upload_pop_csv(page: Page, csv_path: Path):
             }
             return null;
         }""")
-        time.sleep(3)
+        wait_stable(page, '#csvPreviewModal', timeout=5000)
         logger.info("    Pop: clicked Create CSV Preview")
 
         # Step 2: Handle the csvPreviewModal — click "Create Ad(s)" inside it
@@ -273,20 +278,16 @@ def _upload_pop_csv(page: Page, csv_path: Path):
             }
             return 'no_button_in_modal';
         }""")
-        logger.info(f"    Pop: preview modal result: {confirmed}")
+        logger.info("    Pop: preview modal result: %s", confirmed)
 
-        time.sleep(3)
-        try:
-            page.wait_for_load_state("networkidle", timeout=15000)
-        except Exception:
-            pass
-        time.sleep(2)
+        wait_stable(page, '#csvPreviewModal', timeout=10000, state="hidden")
+        wait_ready(page, timeout=15000)
 
         # Dismiss any remaining modals
         page.evaluate("""() => {
             document.querySelectorAll('.modal.show .close, .modal.show [data-dismiss="modal"]').forEach(el => el.click());
         }""")
-        time.sleep(1)
+        wait_stable(page, '.modal.show', timeout=2000, state="hidden")
 
         logger.info("    Pop: CSV upload complete")
 
@@ -294,48 +295,55 @@ def _upload_pop_csv(page: Page, csv_path: Path):
         logger.error(f"    Pop CSV upload failed: {e}")
 
 
+# Which of the ads-table controls are present: {len, sel}
+_ADS_TABLE_STATE_JS = '''() => ({
+    len: !!document.querySelector('select[name="adsTable_length"]'),
+    sel: !!document.querySelector('input[type="checkbox"].checkUncheckAll[data-table="adsTable"]'),
+})'''
+ADS_DELETE_BTN = 'button.massDeleteButton.redButton.smallButton'
+ADS_DELETE_CONFIRM = 'a[data-function="adsManagement.deleteAds"].smallButton.greenButton'
+
+
 def _delete_all_ads(page: Page):
     """Delete all existing ads on the ads page."""
     dismiss_modals(page)
     try:
-        length_dropdown = page.query_selector('select[name="adsTable_length"]')
-        if length_dropdown:
-            page.select_option('select[name="adsTable_length"]', '100')
-            time.sleep(1)
-
-        select_all = page.query_selector(
-            'input[type="checkbox"].checkUncheckAll[data-table="adsTable"]'
-        )
-        if not select_all:
+        # One round-trip decides the no-ads fast path
+        state = page.evaluate(_ADS_TABLE_STATE_JS)
+        if not state["sel"]:
             logger.info("    No ads to delete")
             return
 
-        select_all.click()
-        time.sleep(0.5)
+        if state["len"]:
+            page.select_option('select[name="adsTable_length"]', '100')
+            wait_stable(page, '#adsTable_processing', timeout=3000, state="hidden")
 
-        delete_btn = page.query_selector(
-            'button.massDeleteButton.redButton.smallButton'
-        )
-        if delete_btn and delete_btn.is_visible():
-            delete_btn.click()
-            time.sleep(0.5)
+        page.click('input[type="checkbox"].checkUncheckAll[data-table="adsTable"]')
+
+        # The mass-delete button only shows once rows are selected
+        if wait_stable(page, ADS_DELETE_BTN, timeout=2000):
+            page.click(ADS_DELETE_BTN)
 
             try:
-                yes_btn = page.query_selector(
-                    'a[data-function="adsManagement.deleteAds"].smallButton.greenButton'
-                )
-                if yes_btn:
-                    yes_btn.click()
-                else:
+                try:
+                    page.click(ADS_DELETE_CONFIRM, timeout=2000)
+                except PlaywrightTimeout:
                     page.click('button:has-text("Yes")', timeout=2000)
-                time.sleep(2)
+                rearm_dismiss_modals(page)
+                wait_stable(page, ADS_DELETE_CONFIRM, timeout=5000, state="hidden")
+                wait_stable(page, '#adsTable_processing', timeout=5000, state="hidden")
             except Exception:
                 pass
 
             logger.info("    Deleted existing ads")
 
     except Exception as e:
-        logger.debug(f"    Ad deletion: {e}")
+        logger.debug("    Ad deletion: %s", e)
+
+
+# Ad rotation radios are hidden behind their labels (same markup campaign_automation_v2 drives)
+ROTATION_AUTOPILOT = 'label[data-ad-rotation-trackers="autopilot"]'
+ROTATION_CTR = 'label[for="ad_rotation_autopilot_ctr"]'
 
 
 def _configure_ad_rotation(page: Page):
@@ -345,7 +353,6 @@ def _configure_ad_rotation(page: Page):
     on Step 5 and blocks all clicks.
     """
     dismiss_modals(page)
-    time.sleep(0.5)
 
     # Handle reviewYourBidsModal — appears when bids are below min CPM.
     # Click "Manually Adjust Bids" to dismiss it (TJ auto-floors bids at min).
@@ -363,16 +370,44 @@ def _configure_ad_rotation(page: Page):
         document.body.classList.remove("modal-open");
         document.body.style.overflow = "";
     }''')
-    time.sleep(0.5)
+    wait_stable(page, '#reviewYourBidsModal', timeout=2000, state="hidden")
 
     try:
-        page.get_by_text("Autopilot", exact=True).click(timeout=5000)
-        time.sleep(0.3)
-        page.get_by_text("CTR", exact=True).click(timeout=5000)
-        time.sleep(0.3)
+        page.click(ROTATION_AUTOPILOT, timeout=5000)
+        page.click(ROTATION_CTR, timeout=5000)
         logger.info("    Ad rotation: Autopilot (CTR)")
-    except Exception as e:
-        logger.warning(f"    Could not set ad rotation: {e}")
+    except Exception:
+        # Labels not where we expect — fall back to the (slower) text lookup
+        try:
+            page.get_by_text("Autopilot", exact=True).click(timeout=5000)
+            page.get_by_text("CTR", exact=True).click(timeout=5000)
+            logger.info("    Ad rotation: Autopilot (CTR)")
+        except Exception as e:
+            logger.warning(f"    Could not set ad rotation: {e}")
+
+
+# Truthy once Finish has an outcome: left ad-settings, success modal, or a visible error
+_FINISH_OUTCOME_JS = '''() => {
+    if (!location.pathname.includes("ad-settings")) return "navigated";
+    const shown = el => el.offsetParent !== null;
+    const go = Array.from(document.querySelectorAll("a.smallButton.greenButton"))
+        .find(a => shown(a) && a.textContent.includes("Go to Campaigns"));
+    if (go) return "success_modal";
+    const err = Array.from(document.querySelectorAll(".alert-danger, .error-message, .validation-error"))
+        .find(shown);
+    return err ? "error" : null;
+}'''
+
+
+def _wait_finish_outcome(page: Page, timeout: int = 15000) -> str:
+    """Wait for the Finish click to land instead of sleeping; returns what was seen ("" on timeout)."""
+    try:
+        return page.wait_for_function(_FINISH_OUTCOME_JS, timeout=timeout, polling=250).json_value()
+    except PlaywrightTimeout:
+        return ""
+    except Exception:
+        # Context destroyed mid-poll — the page navigated away
+        return "navigated"
 
 
 def _finish_campaign(page: Page):
@@ -421,7 +456,7 @@ def _finish_campaign(page: Page):
         }""")
         time.sleep(0.5)
 
-        logger.info(f"    [Finish] Clicking Finish Campaign (attempt {attempt+1})")
+        logger.info("    [Finish] Clicking Finish Campaign (attempt %s)", attempt+1)
 
         # Click the confirmed "Finish Campaign" link
         clicked = page.evaluate("""() => {
@@ -455,14 +490,17 @@ def _finish_campaign(page: Page):
             time.sleep(2)
             continue
 
-        logger.info(f"    [Finish] Clicked: {clicked}")
-        time.sleep(3)
-
-        try:
-            page.wait_for_load_state("networkidle", timeout=10000)
-        except Exception:
-            pass
-        time.sleep(2)
+        logger.info("    [Finish] Clicked: %s", clicked)
+        outcome = _wait_finish_outcome(page)
+        logger.debug("    [Finish] Outcome: %s", outcome or 'timeout')
+        if outcome == "navigated":
+            try:
+                page.wait_for_load_state("domcontentloaded", timeout=10000)
+            except Exception:
+                pass
+            if page.url != url_before and "ad-settings" not in page.url:
+                logger.info("    Campaign finished — navigated to: %s", page.url)
+                return
 
         # Check for success modal ("Go to Campaigns" link)
         go_link = page.locator('a.smallButton.greenButton:has-text("Go to Campaigns")')
@@ -486,14 +524,17 @@ def _finish_campaign(page: Page):
                     return {live_id: null};
                 }""")
                 if modal_info.get("live_id"):
-                    logger.info(f"    [Finish] Live ID from modal: {modal_info['live_id']}")
+                    logger.info("    [Finish] Live ID from modal: %s", modal_info['live_id'])
                 else:
-                    logger.info(f"    [Finish] Modal links: {modal_info.get('hrefs', [])}")
+                    logger.info("    [Finish] Modal links: %s", modal_info.get('hrefs', []))
             except Exception:
                 pass
             logger.info("    [Finish] Success modal — clicking Go to Campaigns")
             go_link.first.click(timeout=5000)
-            time.sleep(2)
+            try:
+                page.wait_for_url(lambda u: "ad-settings" not in u, wait_until="commit", timeout=10000)
+            except Exception:
+                pass
             try:
                 page.wait_for_load_state("domcontentloaded", timeout=15000)
             except Exception:
@@ -501,13 +542,13 @@ def _finish_campaign(page: Page):
                 logger.info("    Campaign finished (navigation in progress)")
                 return
             if page.url != url_before and "ad-settings" not in page.url:
-                logger.info(f"    Campaign finished — navigated to: {page.url}")
+                logger.info("    Campaign finished — navigated to: %s", page.url)
                 return
         except Exception:
             pass
 
         if page.url != url_before and "ad-settings" not in page.url:
-            logger.info(f"    Campaign finished — navigated to: {page.url}")
+            logger.info("    Campaign finished — navigated to: %s", page.url)
             return
 
         # Check for validation errors (may fail if page navigated)
@@ -528,7 +569,7 @@ def _finish_campaign(page: Page):
             if errors:
                 logger.warning(f"    [Finish] Validation errors: {errors}")
             else:
-                logger.info(f"    [Finish] Still on: {page.url}")
+                logger.info("    [Finish] Still on: %s", page.url)
         except Exception:
             # Context destroyed = navigation happened = likely success
             logger.info("    [Finish] Page navigated (context destroyed) — likely success")
@@ -614,7 +655,7 @@ def _upload_ad_csv(page: Page, csv_path: Path, campaign_name: str, config: V4Cam
 
         if result.get("status") == "success":
             ads_created = result.get("ads_created", 0)
-            logger.info(f"    CSV uploaded: {ads_created} ads created")
+            logger.info("    CSV uploaded: %s ads created", ads_created)
             return ads_created > 0
         else:
             error = result.get("error", "Unknown error")
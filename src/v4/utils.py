@@ -3,17 +3,41 @@
 import time
 import logging
 import re
+from typing import Optional, Tuple
+from weakref import WeakKeyDictionary
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
 
 logger = logging.getLogger(__name__)
 
+# Element that only exists once each step page has rendered its form
+STEP_SENTINELS = {
+    1: 'input[name="name"]',
+    2: '#geo_country, span[id="select2-geo_country-container"]',
+    3: '#campaignTrackerId, #sourceSelectionTable',
+    4: '#campaign_duration, #daily_budget',
+    5: '#massAdsCsv, select[name="adsTable_length"]',
+}
+
+# Campaign ID in the editor URL, e.g. /campaign/1013013571/ad-settings
+_CAMPAIGN_ID_RE = re.compile(r'/campaign/(\d{4,})(?:/|$|\?)')
+# Fallback: any path segment that is all digits (4+)
+_NUMERIC_SEGMENT_RE = re.compile(r'^(\d{4,})$')
+
+# Last dismiss_modals sweep per page as (url, time.monotonic()). A sweep on a
+# different URL always runs, so navigation re-arms it; the click helpers here
+# re-arm it via rearm_dismiss_modals, and direct page clicks must do the same.
+_LAST_DISMISS: "WeakKeyDictionary[Page, Tuple[str, float]]" = WeakKeyDictionary()
+DISMISS_DEBOUNCE = 0.5
+
 
 # ─── Element interaction helpers ──────────────────────────────────
 
+
 def safe_click(page: Page, selector: str, timeout: int = 5000) -> bool:
     """Try to click an element; return False on timeout instead of raising."""
     try:
         page.click(selector, timeout=timeout)
+        rearm_dismiss_modals(page)
         return True
     except (PlaywrightTimeout, Exception) as e:
         logger.debug(f"safe_click failed for {selector}: {e}")
@@ -23,17 +47,80 @@ def safe_click(page: Page, selector: str, timeout: int = 5000) -> bool:
 def wait_and_fill(page: Page, selector: str, value: str, timeout: int = 5000):
     """Clear a field and fill it with *value*, verifying presence first."""
     page.wait_for_selector(selector, state="visible", timeout=timeout)
-    page.fill(selector, "")
-    page.fill(selector, str(value))
+    page.fill(selector, str(value))  # fill() replaces the existing value
     time.sleep(0.2)
 
 
+def wait_stable(page: Page, selector: str, timeout: int = 3000, state: str = "visible") -> bool:
+    """Wait for *selector* to reach *state*; return False on timeout instead of raising."""
+    try:
+        page.wait_for_selector(selector, state=state, timeout=timeout)
+        return True
+    except PlaywrightTimeout:
+        logger.debug(f"wait_stable timed out for {selector} (state={state})")
+        return False
+
+
+def wait_ready(page: Page, selector: Optional[str] = None, timeout: int = 10000, poll: int = 100) -> bool:
+    """Wait for ``document.readyState == "complete"`` and, if given, *selector* to be visible.
+
+    Both waits share one *timeout* budget; polls every *poll* ms and returns
+    False on timeout instead of raising.
+    """
+    deadline = time.monotonic() + timeout / 1000
+    try:
+        page.wait_for_function('document.readyState === "complete"', timeout=timeout, polling=poll)
+        if selector:
+            remaining = max(1, int((deadline - time.monotonic()) * 1000))
+            page.wait_for_selector(selector, state="visible", timeout=remaining)
+        return True
+    except PlaywrightTimeout:
+        logger.debug(f"wait_ready timed out (selector={selector})")
+        return False
+
+
+def wait_for_select2_ready(page: Page, results_id: str, timeout: int = 3000, text: str = "") -> bool:
+    """Wait until the select2 results list ``ul#<results_id>`` has finished loading.
+
+    Resolves as soon as the list has children and no "Searching…" row, instead
+    of sleeping a fixed time after typing into the search box. Pass the typed
+    *text* for AJAX-backed lists so stale results from before the request (the
+    search is debounced) don't count: a row must contain it, or select2 must
+    show its no-results message.
+    """
+    try:
+        page.wait_for_function(
+            '''([rid, text]) => {
+                const ul = document.getElementById(rid);
+                if (!ul || !ul.children.length || ul.querySelector(".loading-results")) return false;
+                if (!text) return true;
+                const t = text.toLowerCase();
+                return Array.from(ul.children).some(li =>
+                    li.classList.contains("select2-results__message")
+                    || li.textContent.toLowerCase().includes(t));
+            }''',
+            arg=[results_id, text],
+            timeout=timeout,
+        )
+        return True
+    except PlaywrightTimeout:
+        logger.debug(f"select2 results {results_id} not ready after {timeout}ms")
+        return False
+
+
+def wait_for_step(page: Page, step: int, timeout: int = 15000) -> bool:
+    """Wait until the Step *step* form is in the DOM (replaces networkidle + fixed sleeps)."""
+    rearm_dismiss_modals(page)
+    return wait_stable(page, STEP_SENTINELS[step], timeout=timeout, state="attached")
+
+
 def set_radio(page: Page, name: str, value: str):
     """Click a radio button identified by name + value, with JS fallback."""
     selector = f'input[name="{name}"][value="{value}"]'
     try:
-        page.wait_for_selector(selector, timeout=5000)
-        page.locator(selector).click(force=True)
+        radio = page.locator(selector)
+        radio.wait_for(timeout=5000)
+        radio.click(force=True)
     except Exception:
         # JS fallback — some radios are hidden behind custom UI
         page.evaluate(f'''() => {{
@@ -41,21 +128,67 @@ def set_radio(page: Page, name: str, value: str):
             if (el) {{ el.checked = true; el.click();
                        el.dispatchEvent(new Event("change", {{bubbles:true}})); }}
         }}''')
-    time.sleep(0.3)
+    # Radios are often hidden behind custom UI — wait for the checked state, not visibility
+    wait_stable(page, f"{selector}:checked", timeout=1500, state="attached")
+
+
+def set_radios(page: Page, radios: list):
+    """Set several radios (list of (name, value)) in one JS round-trip.
+
+    Radios that are not in the DOM yet (e.g. rendered by a previous radio's
+    change handler) fall back to :func:`set_radio` one by one.
+    """
+    try:
+        missing = page.evaluate('''(radios) => {
+            const missing = [];
+            for (const [name, value] of radios) {
+                const el = document.querySelector(`input[name="${name}"][value="${value}"]`);
+                if (!el) { missing.push(name); continue; }
+                el.click();
+                if (!el.checked) {
+                    el.checked = true;
+                    el.dispatchEvent(new Event("change", {bubbles: true}));
+                }
+            }
+            return missing;
+        }''', [list(r) for r in radios])
+    except Exception as e:
+        logger.debug(f"set_radios batch failed, falling back per field: {e}")
+        missing = [name for name, _ in radios]
+    for name, value in radios:
+        if name in missing:
+            set_radio(page, name, value)
 
 
 def enable_toggle(page: Page, section_id: str):
     """Ensure the toggle checkbox inside a section is checked (via JS)."""
-    page.evaluate(f'''() => {{
-        const section = document.querySelector("#{section_id}");
-        if (!section) return;
-        const cb = section.querySelector("input[type='checkbox']");
-        if (cb && !cb.checked) {{
-            cb.click();
-            cb.dispatchEvent(new Event("change", {{bubbles: true}}));
-        }}
-    }}''')
-    time.sleep(0.8)
+    enable_toggles(page, [section_id])
+
+
+def enable_toggles(page: Page, section_ids: list):
+    """Check the toggles of several sections in one JS pass.
+
+    Pauses once for the revealed sections to render, and only if a toggle
+    actually had to be switched on.
+    """
+    if not section_ids:
+        return
+    switched = page.evaluate('''(ids) => {
+        let switched = 0;
+        for (const id of ids) {
+            const section = document.getElementById(id);
+            if (!section) continue;
+            const cb = section.querySelector("input[type='checkbox']");
+            if (cb && !cb.checked) {
+                cb.click();
+                cb.dispatchEvent(new Event("change", {bubbles: true}));
+                switched++;
+            }
+        }
+        return switched;
+    }''', list(section_ids))
+    if switched:
+        time.sleep(0.8)
 
 
 def disable_toggle(page: Page, section_id: str):
@@ -86,16 +219,49 @@ def select2_choose(page: Page, container_sel: str, search_text: str, timeout: in
     except PlaywrightTimeout:
         # Enter key as fallback
         page.keyboard.press("Enter")
+    rearm_dismiss_modals(page)
     time.sleep(0.3)
 
 
 def select2_clear_all(page: Page, container_sel: str):
-    """Remove all select2 selections inside *container_sel*."""
+    """Remove all select2 selections inside *container_sel*.
+
+    Deselects every option on the backing ``<select>`` in one JS call and
+    lets select2 re-render from the change event.  Only the container's own
+    select is touched (itself, its preceding sibling, or the one select2
+    linked it to); if none is found it falls back to clicking each choice's
+    remove button.
+    """
+    cleared = page.evaluate('''(sel) => {
+        const c = document.querySelector(sel);
+        if (!c) return -1;
+        let s = c.matches("select") ? c : c.querySelector("select");
+        if (!s && c.previousElementSibling && c.previousElementSibling.matches("select")) {
+            s = c.previousElementSibling;
+        }
+        if (!s) {
+            // select2 renders the chosen values into #select2-<select id>-container
+            const r = c.querySelector(".select2-selection__rendered[id^='select2-']");
+            const m = r && r.id.match(/^select2-(.+)-container$/);
+            if (m) s = document.getElementById(m[1]);
+        }
+        if (!s || !s.matches("select")) return -1;
+        const n = s.selectedOptions.length;
+        for (const o of s.options) o.selected = false;
+        if (typeof jQuery !== "undefined") jQuery(s).trigger("change");
+        else s.dispatchEvent(new Event("change", {bubbles: true}));
+        return n;
+    }''', container_sel)
+    if cleared >= 0:
+        return
+
+    # Locator is lazy — build it once and re-resolve it on each pass
+    remove_btn = page.locator(f"{container_sel} .select2-selection__choice__remove").first
     for _ in range(30):
-        remove_btn = page.locator(f"{container_sel} .select2-selection__choice__remove").first
         if remove_btn.count() > 0 and remove_btn.is_visible():
             try:
                 remove_btn.click(timeout=1000)
+                rearm_dismiss_modals(page)
                 time.sleep(0.2)
             except Exception:
                 break
@@ -105,8 +271,23 @@ def select2_clear_all(page: Page, container_sel: str):
 
 # ─── Navigation helpers ──────────────────────────────────────────
 
+def rearm_dismiss_modals(page: Page):
+    """Make the next dismiss_modals call sweep even inside the debounce window.
+
+    Call after any click that may open a modal.
+    """
+    _LAST_DISMISS.pop(page, None)
+
+
 def dismiss_modals(page: Page):
-    """Close any blocking modals (review-bids, bootstrap, backdrop)."""
+    """Close any blocking modals (review-bids, bootstrap, backdrop).
+
+    A repeat call on the same URL within DISMISS_DEBOUNCE seconds of the last
+    sweep is a no-op, unless rearm_dismiss_modals ran in between.
+    """
+    last_url, last_at = _LAST_DISMISS.get(page, ("", 0.0))
+    if last_url == page.url and time.monotonic() - last_at < DISMISS_DEBOUNCE:
+        return
     try:
         page.evaluate('''() => {
             // Close reviewYourBidsModal
@@ -136,49 +317,63 @@ def dismiss_modals(page: Page):
             document.body.style.overflow = "";
         }''')
         time.sleep(0.3)
+        _LAST_DISMISS[page] = (page.url, time.monotonic())
     except Exception:
         pass
 
 
+# Save & Continue buttons across the five steps, most specific first
+SAVE_BUTTON_SELECTORS = [
+    'button.confirmAudience.saveAndContinue',
+    'button.confirmtrackingAdSpotsRules.saveAndContinue',
+    'button#addCampaign',
+    'button.saveAndContinue',
+]
+SAVE_BUTTON_TEXT = "Save & Continue"
+
+# Click the first visible Save button in one round-trip; returns what matched, or null
+_CLICK_SAVE_JS = '''([sels, text]) => {
+    const visible = el => el.offsetParent !== null;
+    for (const s of sels) {
+        const el = Array.from(document.querySelectorAll(s)).find(visible);
+        if (el) { el.click(); return s; }
+    }
+    const btn = Array.from(document.querySelectorAll("button"))
+        .find(b => visible(b) && b.textContent.includes(text));
+    if (btn) { btn.click(); return `button:has-text("${text}")`; }
+    return null;
+}'''
+
+
 def click_save_and_continue(page: Page):
     """Click Save & Continue with multi-selector fallback + URL-change verification."""
     url_before = page.url
     dismiss_modals(page)
 
-    selectors = [
-        'button.confirmAudience.saveAndContinue',
-        'button.confirmtrackingAdSpotsRules.saveAndContinue',
-        'button#addCampaign',
-        'button.saveAndContinue',
-        'button:has-text("Save & Continue")',
-    ]
-
     for attempt in range(6):
         dismiss_modals(page)
-        for sel in selectors:
-            try:
-                locator = page.locator(sel).first
-                if locator.count() > 0 and locator.is_visible(timeout=2000):
-                    logger.info(f"  [Save] Clicking: {sel} (attempt {attempt+1})")
-                    locator.click(timeout=5000)
-                    time.sleep(2)
-                    dismiss_modals(page)
-                    if page.url != url_before:
-                        logger.info(f"  [Save] Navigated to: {page.url}")
-                        return
-                    logger.info(f"  [Save] URL unchanged after click, still: {page.url}")
-                    break  # found a button but page didn't navigate — retry
-            except Exception as e:
-                logger.debug(f"  Save button {sel}: {e}")
-                dismiss_modals(page)
-                continue
-        else:
+        try:
+            clicked = page.evaluate(_CLICK_SAVE_JS, [SAVE_BUTTON_SELECTORS, SAVE_BUTTON_TEXT])
+        except Exception as e:
+            logger.debug(f"  Save button probe: {e}")
+            clicked = None
+        if not clicked:
             if attempt < 5:
                 dismiss_modals(page)
                 time.sleep(1)
                 continue
             break
 
+        logger.info(f"  [Save] Clicking: {clicked} (attempt {attempt+1})")
+        rearm_dismiss_modals(page)  # the click may have opened a modal or a new page
+        _wait_for_url_change(page, url_before)
+        dismiss_modals(page)
+        if page.url != url_before:
+            logger.info(f"  [Save] Navigated to: {page.url}")
+            rearm_dismiss_modals(page)  # new DOM — let the next step sweep it
+            return
+        logger.info(f"  [Save] URL unchanged after click, still: {page.url}")
+
         # Aggressive cleanup between retries
         if attempt < 2:
             logger.info(f"  Save & Continue: page didn't navigate (attempt {attempt + 1}/3), retrying...")
@@ -212,15 +407,34 @@ def click_save_and_continue(page: Page):
 
     # Wait for the new page to settle after navigation
     if page.url != url_before:
+        rearm_dismiss_modals(page)  # new DOM — let the next step sweep it
         try:
             page.wait_for_load_state("domcontentloaded", timeout=15000)
         except Exception:
             pass
-        time.sleep(1)
+
+
+def _wait_for_url_change(page: Page, url_before: str, timeout: int = 5000) -> bool:
+    """Return as soon as the URL differs from *url_before* (False on timeout)."""
+    try:
+        page.wait_for_url(lambda url: url != url_before, wait_until="commit", timeout=timeout)
+        return True
+    except PlaywrightTimeout:
+        return False
+
+
+def save_and_wait_step(page: Page, next_step: int, timeout: int = 15000) -> bool:
+    """Save & Continue, then wait for the *next_step* form instead of a fixed sleep."""
+    click_save_and_continue(page)
+    return wait_for_step(page, next_step, timeout=timeout)
 
 
 def check_session(page: Page) -> bool:
-    """Return True if still on the advertiser site, False if redirected to sign-in."""
+    """Return True if still on the advertiser site, False if redirected to sign-in.
+
+    Only reads page.url, which Playwright tracks client-side — no browser
+    round-trip — so it is cheap enough to call before every step uncached.
+    """
     url = page.url
     if "sign-in" in url or "trafficjunky.com/sign-in" in url:
         logger.warning("Session expired — redirected to sign-in")
@@ -231,13 +445,12 @@ def check_session(page: Page) -> bool:
 def extract_campaign_id(page: Page) -> str:
     """Extract campaign ID from the current URL (first 4+ digit numeric segment)."""
     url = page.url
-    match = re.search(r'/campaign/(\d{4,})(?:/|$|\?)', url)
+    match = _CAMPAIGN_ID_RE.search(url)
     if match:
         return match.group(1)
     # Broader fallback
-    parts = url.split("/")
-    for part in parts:
-        cleaned = part.split("?")[0]
-        if cleaned.isdigit() and len(cleaned) >= 4:
-            return cleaned
+    for part in url.split("?", 1)[0].split("/"):
+        match = _NUMERIC_SEGMENT_RE.match(part)
+        if match:
+            return match.group(1)
     raise RuntimeError(f"Could not extract campaign ID from URL: {url}")
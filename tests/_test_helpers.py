@@ -0,0 +1,24 @@
+"""
+Shared constants for the manual browser test scripts.
+"""
+
+import os
+import sys
+
+# Set TJ_TEST_FAST=1 to skip every end-of-run pause, e.g. in CI
+FAST_MODE = bool(os.environ.get("TJ_TEST_FAST"))
+
+# Hold the browser open at the end only when someone is watching
+PAUSE_AT_END = sys.stdout.isatty() and not FAST_MODE
+
+# True once the table shows only the filtered campaign's row(s)
+FILTERED_JS = """(id) => {
+    const rows = document.querySelectorAll('tr[data-campaign-id]');
+    return rows.length > 0 && [...rows].every(r => r.dataset.campaignId === id);
+}"""
+
+# One round-trip for every row's ID and name
+ROWS_JS = """(rows) => rows.map(r => ({
+    id: r.dataset.campaignId,
+    name: (r.querySelector('.campaignName')?.textContent || '').trim(),
+}))"""
@@ -11,10 +11,14 @@ from src.auth import TJAuthenticator
 from src.uploader import TJUploader
 from src.utils import setup_logger, print_info, print_success, print_error
 
-def test_ad_counting(campaign_id: str):
-    """Test ad counting on a specific campaign."""
+from _test_helpers import PAUSE_AT_END
+
+def test_ad_counting(campaign_ids):
+    """Test ad counting on one or more campaigns, sharing one browser session."""
+    if isinstance(campaign_ids, str):
+        campaign_ids = [campaign_ids]
     
-    print_info(f"Testing ad counting on campaign: {campaign_id}")
+    print_info(f"Testing ad counting on campaign(s): {', '.join(campaign_ids)}")
     print_info("="*60)
     
     # Setup logger
@@ -67,66 +71,79 @@ def test_ad_counting(campaign_id: str):
             page = context.pages[0] if context.pages else context.new_page()
             page.set_default_timeout(Config.TIMEOUT)
         
-        # Navigate to campaign
-        url = f"https://advertiser.trafficjunky.com/campaign/{campaign_id}/ad-settings"
-        print_info(f"Navigating to: {url}")
-        page.goto(url, wait_until='networkidle', timeout=30000)
-        
-        # Wait for page to load
-        page.wait_for_selector('text=STEP 5. CREATE YOUR AD', state='visible', timeout=10000)
-        print_success("✓ Page loaded")
-        
-        # Initialize uploader (to use its counting methods)
+        # Initialize uploader once (to use its counting methods)
         uploader = TJUploader(dry_run=True, take_screenshots=False)
         
-        # Test 1: Count ads WITHOUT setting page length
-        print_info("\n" + "="*60)
-        print_info("TEST 1: Counting ads WITHOUT changing page length")
-        print_info("="*60)
-        count_without = uploader._count_existing_ads(page)
-        print_success(f"Ads found: {count_without}")
-        
-        # Test 2: Set page length to 100 and count again
-        print_info("\n" + "="*60)
-        print_info("TEST 2: Setting page length to 100 and counting again")
-        print_info("="*60)
-        uploader._set_ads_page_length(page, length=100)
-        count_with = uploader._count_existing_ads(page)
-        print_success(f"Ads found: {count_with}")
-        
-        # Test 3: Try "All" option if available
-        print_info("\n" + "="*60)
-        print_info("TEST 3: Testing page reload and recount")
-        print_info("="*60)
-        page.reload(wait_until='networkidle', timeout=30000)
-        uploader._set_ads_page_length(page, length=100)
-        count_after_reload = uploader._count_existing_ads(page)
-        print_success(f"Ads found after reload: {count_after_reload}")
-        
-        # Summary
-        print_info("\n" + "="*60)
-        print_info("SUMMARY")
-        print_info("="*60)
-        print_info(f"Count without page length change: {count_without}")
-        print_info(f"Count with page length = 100:     {count_with}")
-        print_info(f"Count after reload:                {count_after_reload}")
-        
-        if count_with > count_without:
-            print_success(f"\n✅ Page length fix WORKS! Found {count_with - count_without} more ads!")
-        elif count_with == count_without:
-            print_info(f"\n⚠️  Same count ({count_with}) - campaign may have ≤10 ads, or page length already set")
+        # Same browser, context and page for every campaign
+        for campaign_id in campaign_ids:
+            _count_campaign_ads(page, uploader, campaign_id)
         
         # Keep browser open for inspection
-        print_info("\n" + "="*60)
-        print_info("Browser will stay open for 10 seconds for inspection...")
-        print_info("="*60)
-        import time
-        time.sleep(10)
+        if PAUSE_AT_END:
+            print_info("\n" + "="*60)
+            print_info("Browser will stay open for 10 seconds for inspection...")
+            print_info("="*60)
+            import time
+            time.sleep(10)
         
         browser.close()
 
 
+def _count_campaign_ads(page, uploader, campaign_id: str):
+    """Run the three counting checks against one campaign on an open page."""
+    print_info("\n" + "="*60)
+    print_info(f"Campaign: {campaign_id}")
+    print_info("="*60)
+    
+    # Navigate to campaign
+    url = f"https://advertiser.trafficjunky.com/campaign/{campaign_id}/ad-settings"
+    print_info(f"Navigating to: {url}")
+    page.goto(url, wait_until='domcontentloaded', timeout=30000)
+    
+    # Wait for page to load
+    page.wait_for_selector('text=STEP 5. CREATE YOUR AD', state='visible', timeout=10000)
+    print_success("✓ Page loaded")
+    
+    # Test 1: Count ads WITHOUT setting page length
+    print_info("\n" + "="*60)
+    print_info("TEST 1: Counting ads WITHOUT changing page length")
+    print_info("="*60)
+    count_without = uploader._count_existing_ads(page)
+    print_success(f"Ads found: {count_without}")
+    
+    # Test 2: Set page length to 100 and count again
+    print_info("\n" + "="*60)
+    print_info("TEST 2: Setting page length to 100 and counting again")
+    print_info("="*60)
+    uploader._set_ads_page_length(page, length=100)
+    count_with = uploader._count_existing_ads(page)
+    print_success(f"Ads found: {count_with}")
+    
+    # Test 3: Try "All" option if available
+    print_info("\n" + "="*60)
+    print_info("TEST 3: Testing page reload and recount")
+    print_info("="*60)
+    page.reload(wait_until='domcontentloaded', timeout=30000)
+    page.wait_for_selector('text=STEP 5. CREATE YOUR AD', state='visible', timeout=10000)
+    uploader._set_ads_page_length(page, length=100)
+    count_after_reload = uploader._count_existing_ads(page)
+    print_success(f"Ads found after reload: {count_after_reload}")
+    
+    # Summary
+    print_info("\n" + "="*60)
+    print_info("SUMMARY")
+    print_info("="*60)
+    print_info(f"Count without page length change: {count_without}")
+    print_info(f"Count with page length = 100:     {count_with}")
+    print_info(f"Count after reload:                {count_after_reload}")
+    
+    if count_with > count_without:
+        print_success(f"\n✅ Page length fix WORKS! Found {count_with - count_without} more ads!")
+    elif count_with == count_without:
+        print_info(f"\n⚠️  Same count ({count_with}) - campaign may have ≤10 ads, or page length already set")
+
+
 if __name__ == '__main__':
-    campaign_id = sys.argv[1] if len(sys.argv) > 1 else '1013013571'
-    test_ad_counting(campaign_id)
+    campaign_ids = sys.argv[1:] or ['1013013571']
+    test_ad_counting(campaign_ids)
 
@@ -8,6 +8,8 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from campaign_automation.creator import CampaignCreator
 
+from _test_helpers import PAUSE_AT_END
+
 
 async def test_connection():
     """Test if we can connect to TrafficJunky with saved session."""
@@ -50,7 +52,8 @@ async def test_connection():
                 print("\n✗ Session expired - not logged in")
                 print("\nTo create a new session:")
                 print("  python3 main.py --create-session")
-                await asyncio.sleep(3)
+                if PAUSE_AT_END:
+                    await asyncio.sleep(3)
                 return False
             
             # Check for campaign elements
@@ -61,15 +64,18 @@ async def test_connection():
                 print("⚠ Cannot find campaigns table - may not be on correct page")
             
             # Count campaigns
-            campaign_rows = await creator.page.query_selector_all('tr[data-campaign-id]')
-            print(f"✓ Found {len(campaign_rows)} campaign(s) in your account")
+            campaign_count = await creator.page.eval_on_selector_all(
+                'tr[data-campaign-id]', 'rows => rows.length'
+            )
+            print(f"✓ Found {campaign_count} campaign(s) in your account")
             
             print("\n" + "="*65)
             print("✓ CONNECTION TEST PASSED")
             print("="*65)
             print("\nSession is valid and working!")
-            print("Browser will close in 5 seconds...")
-            await asyncio.sleep(5)
+            if PAUSE_AT_END:
+                print("Browser will close in 5 seconds...")
+                await asyncio.sleep(5)
             
             return True
             
@@ -3,17 +3,25 @@
 import asyncio
 import sys
 from pathlib import Path
+from playwright.async_api import TimeoutError as PlaywrightTimeout
 
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from campaign_automation.creator import CampaignCreator
 from campaign_templates import TEMPLATE_CAMPAIGNS
 
+from _test_helpers import PAUSE_AT_END, FILTERED_JS, ROWS_JS
+
 
 async def test_filter():
     """Test if we can filter and find template campaigns."""
     session_file = Path("session.json")
     
+    # Template IDs/names are fixed for the run — bind them once
+    desktop, ios = TEMPLATE_CAMPAIGNS["desktop"], TEMPLATE_CAMPAIGNS["ios"]
+    desktop_id, desktop_name = desktop["id"], desktop["name"]
+    ios_id, ios_name = ios["id"], ios["name"]
+    
     print("\n" + "="*65)
     print("CAMPAIGN FILTER TEST (Read-Only)")
     print("="*65 + "\n")
@@ -27,99 +35,35 @@ async def test_filter():
         async with CampaignCreator(session_file, headless=False, slow_mo=1000) as creator:
             print("✓ Browser launched")
             
-            # Navigate to campaigns page
-            print("→ Navigating to campaigns page...")
-            await creator.page.goto("https://advertiser.trafficjunky.com/campaigns")
-            await creator.page.wait_for_load_state("networkidle")
-            print("✓ Page loaded")
-            
-            # Test Desktop template
-            print("\n" + "-"*65)
-            print("Testing Desktop Template Filter")
-            print("-"*65)
-            
-            desktop_id = TEMPLATE_CAMPAIGNS["desktop"]["id"]
-            desktop_name = TEMPLATE_CAMPAIGNS["desktop"]["name"]
-            
-            print(f"→ Filtering for campaign ID: {desktop_id}")
-            
-            # Clear any existing filter
-            id_input = await creator.page.query_selector('input[name="id"]')
-            if id_input:
-                await id_input.fill("")
-            
-            await creator.page.fill('input[name="id"]', desktop_id)
-            await creator.page.keyboard.press("Enter")
-            await asyncio.sleep(2)
-            
-            # Check results
-            campaign_rows = await creator.page.query_selector_all('tr[data-campaign-id]')
-            print(f"✓ Found {len(campaign_rows)} matching campaign(s)")
-            
-            if len(campaign_rows) == 0:
-                print("✗ Desktop template campaign not found!")
-                print(f"  Expected ID: {desktop_id}")
-                print(f"  Expected Name: {desktop_name}")
+            # The two checks are independent and read-only — run them side by
+            # side, each in its own context carrying the logged-in session
+            state = await creator.context.storage_state()
+            ctx_a = await creator.browser.new_context(storage_state=state)
+            ctx_b = await creator.browser.new_context(storage_state=state)
+            try:
+                (desktop_ok, desktop_log), (ios_ok, ios_log) = await asyncio.gather(
+                    _probe(ctx_a, "Desktop", desktop_id, desktop_name),
+                    _probe(ctx_b, "iOS", ios_id, ios_name),
+                )
+            finally:
+                await ctx_a.close()
+                await ctx_b.close()
+            
+            # Print each probe's report in order (they ran interleaved)
+            for line in desktop_log + ios_log:
+                print(line)
+            
+            if not (desktop_ok and ios_ok):
                 return False
             
-            # Verify it's the right campaign
-            campaign_row = campaign_rows[0]
-            row_id = await campaign_row.get_attribute('data-campaign-id')
-            
-            if row_id == desktop_id:
-                print(f"✓ Found correct campaign: ID {row_id}")
-            else:
-                print(f"⚠ Found different campaign: ID {row_id}")
-            
-            # Get campaign name
-            name_elem = await creator.page.query_selector('.campaignName')
-            if name_elem:
-                name = await name_elem.text_content()
-                name = name.strip()
-                print(f"  Name: {name}")
-                
-                if desktop_name in name or "TEMPLATE" in name:
-                    print("✓ Template campaign verified")
-                else:
-                    print("⚠ Campaign name doesn't match template pattern")
-            
-            # Test iOS template
-            print("\n" + "-"*65)
-            print("Testing iOS Template Filter")
-            print("-"*65)
-            
-            ios_id = TEMPLATE_CAMPAIGNS["ios"]["id"]
-            ios_name = TEMPLATE_CAMPAIGNS["ios"]["name"]
-            
-            print(f"→ Filtering for campaign ID: {ios_id}")
-            
-            await creator.page.fill('input[name="id"]', "")
-            await creator.page.fill('input[name="id"]', ios_id)
-            await creator.page.keyboard.press("Enter")
-            await asyncio.sleep(2)
-            
-            campaign_rows = await creator.page.query_selector_all('tr[data-campaign-id]')
-            print(f"✓ Found {len(campaign_rows)} matching campaign(s)")
-            
-            if len(campaign_rows) == 0:
-                print("✗ iOS template campaign not found!")
-                print(f"  Expected ID: {ios_id}")
-                print(f"  Expected Name: {ios_name}")
-                return False
-            
-            name_elem = await creator.page.query_selector('.campaignName')
-            if name_elem:
-                name = await name_elem.text_content()
-                name = name.strip()
-                print(f"  Name: {name}")
-            
             print("\n" + "="*65)
             print("✓ FILTER TEST PASSED")
             print("="*65)
             print("\n✓ Both template campaigns found")
             print("✓ Campaign filtering works correctly")
-            print("\nBrowser will close in 5 seconds...")
-            await asyncio.sleep(5)
+            if PAUSE_AT_END:
+                print("\nBrowser will close in 5 seconds...")
+                await asyncio.sleep(5)
             
             return True
             
@@ -130,6 +74,62 @@ async def test_filter():
         return False
 
 
+async def _probe(context, label, campaign_id, campaign_name):
+    """Filter the campaigns list for one template; returns (found, report lines)."""
+    log = [
+        "\n" + "-"*65,
+        f"Testing {label} Template Filter",
+        "-"*65,
+    ]
+    page = await context.new_page()
+    
+    # Wait for the filter input, not networkidle (dashboard beacons keep it busy)
+    await page.goto("https://advertiser.trafficjunky.com/campaigns", wait_until="domcontentloaded")
+    await page.wait_for_selector('input[name="id"]', state="visible")
+    log.append("✓ Page loaded")
+    
+    log.append(f"→ Filtering for campaign ID: {campaign_id}")
+    
+    # fill() replaces any existing filter value
+    await page.locator('input[name="id"]').fill(campaign_id)
+    await page.keyboard.press("Enter")
+    try:
+        await page.wait_for_function(FILTERED_JS, arg=campaign_id, timeout=5000)
+    except PlaywrightTimeout:
+        pass  # no matching row — reported below
+    
+    # Check results
+    campaign_rows = await page.eval_on_selector_all('tr[data-campaign-id]', ROWS_JS)
+    log.append(f"✓ Found {len(campaign_rows)} matching campaign(s)")
+    
+    if len(campaign_rows) == 0:
+        log.append(f"✗ {label} template campaign not found!")
+        log.append(f"  Expected ID: {campaign_id}")
+        log.append(f"  Expected Name: {campaign_name}")
+        return False, log
+    
+    # Verify it's the right campaign
+    campaign_row = campaign_rows[0]
+    row_id = campaign_row["id"]
+    
+    if row_id == campaign_id:
+        log.append(f"✓ Found correct campaign: ID {row_id}")
+    else:
+        log.append(f"⚠ Found different campaign: ID {row_id}")
+    
+    # Get campaign name
+    name = campaign_row["name"]
+    if name:
+        log.append(f"  Name: {name}")
+        
+        if campaign_name in name or "TEMPLATE" in name:
+            log.append("✓ Template campaign verified")
+        else:
+            log.append("⚠ Campaign name doesn't match template pattern")
+    
+    return True, log
+
+
 def main():
     """Run the filter test."""
     result = asyncio.run(test_filter())
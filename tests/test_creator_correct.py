@@ -5,7 +5,7 @@ Test campaign creator using EXACT pattern from native_main.py
 
 import sys
 from pathlib import Path
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -15,7 +15,14 @@ from auth import TJAuthenticator
 from campaign_automation.creator_sync import CampaignCreator
 from campaign_templates import TEMPLATE_CAMPAIGNS
 
+from _test_helpers import PAUSE_AT_END, FILTERED_JS, ROWS_JS
+
+
 def main():
+    # Template IDs are fixed for the run — bind them once
+    desktop_id = TEMPLATE_CAMPAIGNS["desktop"]["id"]
+    ios_id = TEMPLATE_CAMPAIGNS["ios"]["id"]
+    
     print("\n" + "="*65)
     print("CAMPAIGN CREATOR TEST (Using Existing Pattern)")
     print("="*65 + "\n")
@@ -80,44 +87,49 @@ def main():
             
             # Test 1: Filter for Desktop template
             print("Test 1: Filter for Desktop template")
-            page.goto("https://advertiser.trafficjunky.com/campaigns")
-            page.wait_for_load_state("networkidle")
+            # Wait for the filter input, not networkidle (dashboard beacons keep it busy)
+            page.goto("https://advertiser.trafficjunky.com/campaigns", wait_until="domcontentloaded")
+            page.wait_for_selector('input[name="id"]', state="visible")
+            
+            # Locator is lazy — build it once and reuse it for both filters
+            id_input = page.locator('input[name="id"]')
             
-            desktop_id = TEMPLATE_CAMPAIGNS["desktop"]["id"]
             print(f"  Template ID: {desktop_id}")
             
-            page.fill('input[name="id"]', desktop_id)
+            id_input.fill(desktop_id)
             page.keyboard.press("Enter")
-            page.wait_for_timeout(2000)
+            try:
+                page.wait_for_function(FILTERED_JS, arg=desktop_id, timeout=5000)
+            except PlaywrightTimeout:
+                pass  # no matching row — reported below
             
-            campaign_rows = page.query_selector_all('tr[data-campaign-id]')
+            campaign_rows = page.eval_on_selector_all('tr[data-campaign-id]', ROWS_JS)
             print(f"  ✓ Found {len(campaign_rows)} campaign(s)")
             
             if len(campaign_rows) > 0:
-                name_elem = page.query_selector('.campaignName')
-                if name_elem:
-                    name = name_elem.text_content().strip()
+                name = campaign_rows[0]["name"]
+                if name:
                     print(f"  Campaign: {name}")
             else:
                 print("  ✗ Desktop template not found!")
             
             # Test 2: Filter for iOS template
             print("\nTest 2: Filter for iOS template")
-            ios_id = TEMPLATE_CAMPAIGNS["ios"]["id"]
             print(f"  Template ID: {ios_id}")
             
-            page.fill('input[name="id"]', "")
-            page.fill('input[name="id"]', ios_id)
+            id_input.fill(ios_id)
             page.keyboard.press("Enter")
-            page.wait_for_timeout(2000)
+            try:
+                page.wait_for_function(FILTERED_JS, arg=ios_id, timeout=5000)
+            except PlaywrightTimeout:
+                pass  # no matching row — reported below
             
-            campaign_rows = page.query_selector_all('tr[data-campaign-id]')
+            campaign_rows = page.eval_on_selector_all('tr[data-campaign-id]', ROWS_JS)
             print(f"  ✓ Found {len(campaign_rows)} campaign(s)")
             
             if len(campaign_rows) > 0:
-                name_elem = page.query_selector('.campaignName')
-                if name_elem:
-                    name = name_elem.text_content().strip()
+                name = campaign_rows[0]["name"]
+                if name:
                     print(f"  Campaign: {name}")
             else:
                 print("  ✗ iOS template not found!")
@@ -126,8 +138,9 @@ def main():
             print("✓ TESTS PASSED")
             print("="*65)
             print("\nCampaign creator is working!")
-            print("Browser will close in 5 seconds...")
-            page.wait_for_timeout(5000)
+            if PAUSE_AT_END:
+                print("Browser will close in 5 seconds...")
+                page.wait_for_timeout(5000)
             
         except Exception as e:
             print(f"\n✗ Error: {e}")
@@ -17,6 +17,8 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 from campaign_automation.creator_sync import CampaignCreator
 from campaign_templates import TEMPLATE_CAMPAIGNS
 
+from _test_helpers import PAUSE_AT_END
+
 def main():
     print("\n" + "="*65)
     print("CAMPAIGN CREATOR - MANUAL LOGIN TEST")
@@ -100,8 +102,7 @@ def main():
             print(f"  Template ID: {ios_id}")
             print(f"  Template Name: {ios_name}")
             
-            page.fill('input[name="id"]', "")  # Clear
-            page.fill('input[name="id"]', ios_id)
+            page.fill('input[name="id"]', ios_id)  # fill() replaces the old filter
             page.keyboard.press("Enter")
             time.sleep(2)
             
@@ -126,8 +127,9 @@ def main():
             print("="*65)
             print("\nCampaign Creator is working correctly!")
             print("You can now use it to create real campaigns.")
-            print("\nBrowser will close in 10 seconds...")
-            time.sleep(10)
+            if PAUSE_AT_END:
+                print("\nBrowser will close in 10 seconds...")
+                time.sleep(10)
             
         except Exception as e:
             print(f"\n✗ Error: {e}")
@@ -15,6 +15,8 @@ from campaign_automation.creator_sync import CampaignCreator
 from campaign_templates import TEMPLATE_CAMPAIGNS
 from config import Config
 
+from _test_helpers import PAUSE_AT_END
+
 def main():
     print("\n" + "="*65)
     print("CAMPAIGN CREATOR TEST (with Auth)")
@@ -89,8 +91,9 @@ def main():
             print("✓ TEST PASSED")
             print("="*65)
             print("\nCampaign creator is ready to use!")
-            print("Browser will close in 5 seconds...")
-            time.sleep(5)
+            if PAUSE_AT_END:
+                print("Browser will close in 5 seconds...")
+                time.sleep(5)
             
         except Exception as e:
             print(f"\n✗ Error: {e}")
@@ -25,6 +25,21 @@ from campaign_automation.csv_parser import parse_csv
 from campaign_templates import generate_campaign_name, DEFAULT_SETTINGS
 from native_uploader import NativeUploader
 from native_csv_processor import NativeCSVProcessor
+from _test_helpers import FAST_MODE
+
+# Init script that hides the usual automation markers
+HIDE_AUTOMATION_JS = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en']
+    });
+"""
+
 
 def main():
     print("\n" + "="*65)
@@ -105,8 +120,12 @@ def main():
         # Use persistent context with your actual Chrome profile
         # This will use your real Chrome with all cookies and history
         print("→ Launching Chrome with your profile...")
+        # Stable profile dir (not /tmp) so cookies and cache survive reboots
+        profile_dir = Config.CHROME_PROFILE_DIR
+        had_profile = profile_dir.exists()
+        profile_dir.mkdir(parents=True, exist_ok=True)
         context = p.chromium.launch_persistent_context(
-            user_data_dir="/tmp/playwright-chrome-profile",  # Temporary profile
+            user_data_dir=str(profile_dir),
             channel="chrome",    # Use installed Chrome
             headless=False,
             slow_mo=500,
@@ -116,6 +135,10 @@ def main():
             ]
         )
         
+        # Hide automation markers on every page of the context (runs on each
+        # navigation, so it also covers the profile's already-open first page)
+        context.add_init_script(HIDE_AUTOMATION_JS)
+        
         page = context.pages[0] if context.pages else context.new_page()
         page.set_default_timeout(60000)
         
@@ -124,28 +147,25 @@ def main():
         # Login using existing pattern
         authenticator = TJAuthenticator(Config.TJ_USERNAME, Config.TJ_PASSWORD)
         
-        # Add script to hide automation markers
-        page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5]
-            });
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en']
-            });
-        """)
+        # Reuse the profile's TJ session if it is still valid
+        logged_in = False
+        if had_profile:
+            print("→ Checking saved profile session...")
+            page.goto('https://advertiser.trafficjunky.com/campaigns', wait_until='domcontentloaded')
+            logged_in = authenticator.is_logged_in(page)
         
-        print("→ Logging in with manual_login...")
-        if not authenticator.manual_login(page):
-            print("✗ Login failed")
-            context.close()
-            return 1
-        
-        print("✓ Login successful")
-        # Note: persistent context handles session automatically
-        print("✓ Session saved")
+        if logged_in:
+            print("✓ Logged in using saved profile")
+        else:
+            print("→ Logging in with manual_login...")
+            if not authenticator.manual_login(page):
+                print("✗ Login failed")
+                context.close()
+                return 1
+            
+            print("✓ Login successful")
+            # Note: persistent context handles session automatically
+            print("✓ Session saved")
         
         # Create campaigns
         try:
@@ -271,7 +291,7 @@ def main():
             print("\nBrowser will stay open so you can pause them...")
             if sys.stdin.isatty():
                 input("\nPress Enter when done to close browser...")
-            else:
+            elif not FAST_MODE:
                 print("\n→ Non-interactive mode: Browser will close in 30 seconds...")
                 page.wait_for_timeout(30000)
             
@@ -281,7 +301,7 @@ def main():
             traceback.print_exc()
             if sys.stdin.isatty():
                 input("\nPress Enter to close browser...")
-            else:
+            elif not FAST_MODE:
                 print("\n→ Error occurred, browser will close in 10 seconds...")
                 page.wait_for_timeout(10000)
             return 1
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the V4 campaign CSV parser.
+Parses small throwaway CSVs — no browser automation.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from v4.csv_parser import parse_v4_csv
+
+
+def _write_csv(text: str) -> Path:
+    tmp = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8")
+    with tmp:
+        tmp.write(text)
+    return Path(tmp.name)
+
+
+def test_trailing_comma_row_keeps_columns():
+    """A row with one more field than the header must not shift values left."""
+    csv_path = _write_csv("group,csv_file\nG1,a.csv,extra\nG2,b.csv,\n")
+    try:
+        configs = parse_v4_csv(csv_path, use_cache=False)
+    finally:
+        csv_path.unlink()
+
+    assert [(c.group, c.csv_file) for c in configs] == [("G1", "a.csv"), ("G2", "b.csv")]
+    print("✓ Trailing-comma rows keep group/csv_file in place")
+
+
+def test_short_row_uses_defaults():
+    """A row with fewer fields than the header gets empty values, not NaN."""
+    csv_path = _write_csv("group,csv_file,daily_budget\nG1,a.csv\n")
+    try:
+        configs = parse_v4_csv(csv_path, use_cache=False)
+    finally:
+        csv_path.unlink()
+
+    assert configs[0].group == "G1"
+    assert configs[0].daily_budget == 25.00
+    print("✓ Short rows fall back to defaults")
+
+
+def main():
+    """Run all tests."""
+    print("="*70)
+    print("V4 CSV PARSER TESTS")
+    print("="*70)
+
+    try:
+        test_trailing_comma_row_keeps_columns()
+        test_short_row_uses_defaults()
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    print("\n✓ ALL TESTS PASSED")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())